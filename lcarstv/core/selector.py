@@ -6,7 +6,7 @@ import re
 import copy
 import threading
 from dataclasses import dataclass, field
-from pathlib import Path
+from functools import lru_cache
 from typing import Any
 
 from .state_store import PersistedChannel, PersistedState, StateStore
@@ -24,51 +24,87 @@ def _seed_for(call_sign: str, *, bag_epoch: int, items_fp: str) -> int:
     return int.from_bytes(hashlib.sha256(raw).digest()[:8], "big", signed=False)
 
 
+def _basename(item_id: str) -> str:
+    """Trailing filename of a path-like item ID (either separator), without building a Path."""
+    return item_id.rpartition("/")[2].rpartition("\\")[2]
+
+
+# Matches patterns like S01E05, s02e12, etc. Compiled once; used for every sequential sort key.
+_EP_RE = re.compile(r"[Ss](\d+)[Ee](\d+)")
+
+
+@lru_cache(maxsize=4096)
 def _parse_episode_info(item_id: str) -> tuple[int, int] | None:
     """Parse SxxExx pattern from item ID (typically a file path).
     
     Returns (season, episode) tuple or None if pattern not found.
+    Memoized: sequential picks re-sort the same block IDs on every selection.
     """
     # Extract filename from path-like strings
-    filename = Path(item_id).name if "/" in item_id or "\\" in item_id else item_id
+    filename = _basename(item_id)
     
-    # Match patterns like S01E05, s02e12, etc.
-    match = re.search(r'[Ss](\d+)[Ee](\d+)', filename)
-    if match:
-        season = int(match.group(1))
-        episode = int(match.group(2))
-        return (season, episode)
-    return None
+    match = _EP_RE.search(filename)
+    return (int(match.group(1)), int(match.group(2))) if match else None
 
 
-def _sort_items_sequentially(items: tuple[str, ...]) -> list[str]:
-    """Sort items by season/episode number, falling back to alphabetical for items without SxxExx.
-    
-    Items with episode info are sorted first by season then episode.
-    Items without episode info are sorted alphabetically and placed at the end.
-    """
-    items_with_ep: list[tuple[str, int, int]] = []
-    items_without_ep: list[str] = []
-    
-    for item in items:
+def _compute_order(items: tuple[str, ...]) -> tuple[int, ...]:
+    """Indices of items in sequential order (see _sort_items_sequentially)."""
+    episodes: list[tuple[tuple[int, int], int]] = []
+    specials: list[tuple[str, int]] = []
+    for i, item in enumerate(items):
         ep_info = _parse_episode_info(item)
         if ep_info:
-            season, episode = ep_info
-            items_with_ep.append((item, season, episode))
+            episodes.append((ep_info, i))
         else:
-            items_without_ep.append(item)
+            specials.append((str(item).lower(), i))
     
-    # Sort items with episode info by (season, episode)
-    items_with_ep.sort(key=lambda x: (x[1], x[2]))
+    order: list[int] = []
+    if episodes:
+        # Pack (season, episode, index) into one int so the sort compares plain ints.
+        # The stride comes from the data, so the packing is exact for any numbers.
+        n = len(items)
+        stride = max(episode for (_season, episode), _i in episodes) + 1
+        keys = sorted((season * stride + episode) * n + i for (season, episode), i in episodes)
+        order = [key % n for key in keys]
     
-    # Sort items without episode info alphabetically
-    items_without_ep.sort(key=lambda x: str(x).lower())
+    # The index breaks name ties, keeping input order
+    specials.sort()
+    order.extend(i for _name, i in specials)
     
-    # Combine: episodic content first, then non-episodic
-    result = [item for item, _, _ in items_with_ep]
-    result.extend(items_without_ep)
+    return tuple(order)
+
+
+def _sort_items_sequentially(items: tuple[str, ...]) -> list[str]:
+    """Sort items by season/episode number, falling back to alphabetical for items without SxxExx.
     
-    return result
+    Items with episode info are sorted first by season then episode.
+    Items without episode info are sorted alphabetically and placed at the end.
+    Ties keep their input order.
+    """
+    return [items[i] for i in _compute_order(items)]
+
+
+class SequentialPlaylist:
+    """A fixed item list in sequential order, sorted once; each pick is an index lookup."""
+
+    __slots__ = ("_items", "_order")
+
+    def __init__(self, items: tuple[str, ...]) -> None:
+        self._items = items
+        self._order = _compute_order(items)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def pick(self, index: int) -> str:
+        """Item at position index of the sequential order (wraps around)."""
+        return self._items[self._order[index % len(self._order)]]
+
+
+@lru_cache(maxsize=64)
+def _sequential_playlist(items: tuple[str, ...]) -> SequentialPlaylist:
+    """Playlist for items, memoized so repeated picks on the same block set skip the sort."""
+    return SequentialPlaylist(items)
 
 
 @dataclass
@@ -206,25 +242,26 @@ class SmartRandomSelector:
         cs = call_sign.strip().upper()
         ch = self._get_channel_ref(cs, persist=persist)
         
-        # Sort items sequentially
-        sorted_items = _sort_items_sequentially(items)
+        # Sequential order (sorted once per distinct item set)
+        playlist = _sequential_playlist(items)
+        count = len(playlist)
         
         # Clamp index to valid range
-        if ch.sequential_index < 0 or ch.sequential_index >= len(sorted_items):
+        if ch.sequential_index < 0 or ch.sequential_index >= count:
             ch.sequential_index = 0
         
         # Select current item
-        selected = sorted_items[ch.sequential_index]
+        selected = playlist.pick(ch.sequential_index)
         
         # Advance to next item (wrap around at end)
-        ch.sequential_index = (ch.sequential_index + 1) % len(sorted_items)
+        ch.sequential_index = (ch.sequential_index + 1) % count
         
         if persist and save:
             self.store.save(self.state)
         
         if self.debug and persist and save:
             print(
-                f"[debug] {cs} sequential: selected={selected} next_index={ch.sequential_index}/{len(sorted_items)}"
+                f"[debug] {cs} sequential: selected={selected} next_index={ch.sequential_index}/{count}"
             )
         
         return str(selected)
@@ -293,21 +330,22 @@ class SmartRandomSelector:
                 if is_sequential:
                     # Sequential: use shadow sequential_index
                     seq_index = int(shadow_state.get("sequential_index", 0))
-                    sorted_items = _sort_items_sequentially(tuple(eligible))
+                    playlist = _sequential_playlist(tuple(eligible))
+                    count = len(playlist)
                     
                     # Wrap around if needed
-                    if seq_index < 0 or seq_index >= len(sorted_items):
+                    if seq_index < 0 or seq_index >= count:
                         seq_index = 0
                     
-                    selected = sorted_items[seq_index]
+                    selected = playlist.pick(seq_index)
                     
                     # Advance shadow index
-                    seq_index = (seq_index + 1) % len(sorted_items)
+                    seq_index = (seq_index + 1) % count
                     shadow_state["sequential_index"] = seq_index
                     
                     if self.debug and persist and save:
                         print(
-                            f"[debug] {cs} aggregate: {source_cs} sequential selected={selected} next_index={seq_index}/{len(sorted_items)}"
+                            f"[debug] {cs} aggregate: {source_cs} sequential selected={selected} next_index={seq_index}/{count}"
                         )
                 else:
                     # Random with cooldown: use shadow bag state
@@ -1,7 +1,28 @@
 from __future__ import annotations
 
+import errno
 import os
-from typing import Any
+from typing import Any, Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows: no fcntl, the lock is a no-op there
+    fcntl = None
+
+# flock(LOCK_NB) failures meaning "held elsewhere" (EWOULDBLOCK == EAGAIN on Linux).
+_LOCK_HELD_ERRNOS = frozenset({errno.EAGAIN, errno.EWOULDBLOCK, errno.EACCES})
+
+# Lockfile content, formatted once per process (refreshed in forked children).
+_PID_BYTES = f"{os.getpid()}\n".encode("ascii")
+
+
+def _refresh_pid_bytes() -> None:
+    global _PID_BYTES
+    _PID_BYTES = f"{os.getpid()}\n".encode("ascii")
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_refresh_pid_bytes)
 
 
 class SingleInstanceLock:
@@ -12,6 +33,9 @@ class SingleInstanceLock:
     existing behavior. On Linux/Pi, uses an exclusive file lock to ensure only one
     instance of the application can run at a time.
     
+    The lockfile descriptor is opened with O_CLOEXEC, so child processes (mpv) never
+    inherit it and cannot keep the lock held after release() or after the app exits.
+    
     Usage:
         lock = SingleInstanceLock(enabled=(os.name != "nt"))
         if not lock.acquire():
@@ -30,6 +54,10 @@ class SingleInstanceLock:
             # ... application code ...
     """
 
+    # Bound per instance in __init__ (see _acquire_flock / _release_flock).
+    acquire: Callable[[], bool]
+    release: Callable[[], None]
+
     def __init__(self, path: str = "/tmp/lcarstv.lock", enabled: bool = True) -> None:
         """
         Initialize the single-instance lock.
@@ -45,45 +73,53 @@ class SingleInstanceLock:
         self._fd: int | None = None
         self.acquired = False
 
-    def acquire(self) -> bool:
+        # Pick the implementation once so acquire()/release() never re-check the platform.
+        if self.enabled and fcntl is not None:
+            self.acquire = self._acquire_flock
+            self.release = self._release_flock
+        else:
+            self.acquire = self._acquire_noop
+            self.release = self._release_noop
+
+    def _acquire_noop(self) -> bool:
+        """Disabled lock: always succeeds."""
+        self.acquired = True
+        return True
+
+    def _release_noop(self) -> None:
+        """Disabled lock: nothing to release."""
+
+    def _acquire_flock(self) -> bool:
         """
         Attempt to acquire the lock.
         
         Returns:
-            True if the lock was acquired (or if disabled).
+            True if the lock was acquired.
             False if another instance already holds the lock.
         """
-        if not self.enabled:
-            self.acquired = True
-            return True
-
-        # Import fcntl only on Unix systems where it's available
         try:
-            import fcntl
-        except ImportError:
-            # fcntl not available (shouldn't happen given enabled check, but be safe)
-            self.acquired = True
-            return True
-
-        try:
-            # Open lockfile for writing (create if doesn't exist)
-            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT, 0o644)
+            # Open lockfile for writing (create if doesn't exist); never inherited by
+            # child processes such as mpv.
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_CLOEXEC, 0o644)
             
-            # Try to acquire an exclusive, non-blocking lock
+            # Try to acquire an exclusive, non-blocking lock: one syscall, no retries.
+            # This is needed even when the open above created the file: the lockfile
+            # is kept between runs, and other instances only ever contend on the flock.
             try:
                 fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-            except BlockingIOError:
-                # Lock is already held by another process
+            except OSError as e:
                 os.close(fd)
                 self.acquired = False
-                return False
+                if e.errno in _LOCK_HELD_ERRNOS:
+                    # Lock is already held by another process
+                    return False
+                raise
             
-            # Lock acquired! Write our PID to the file
+            # Lock acquired! Write our PID to the file. The flock is the lock; the PID is
+            # informational, so it is not fsync'd.
             self._fd = fd
-            pid_str = f"{os.getpid()}\n"
-            os.ftruncate(fd, 0)  # Clear any previous content
-            os.write(fd, pid_str.encode("utf-8"))
-            os.fsync(fd)  # Ensure it's written to disk
+            os.pwrite(fd, _PID_BYTES, 0)
+            os.ftruncate(fd, len(_PID_BYTES))  # Drop any longer previous content
             
             self.acquired = True
             return True
@@ -99,29 +135,28 @@ class SingleInstanceLock:
             self.acquired = False
             return False
 
-    def release(self) -> None:
+    def _release_flock(self) -> None:
         """
         Release the lock if it was acquired.
         
         This is idempotent - safe to call multiple times.
         """
-        if not self.enabled or self._fd is None:
+        # Detach the fd before any syscall so repeated calls are a single compare.
+        fd, self._fd = self._fd, None
+        self.acquired = False
+        if fd is None:
             return
 
         try:
-            import fcntl
             # Explicitly unlock (though closing fd would do this automatically)
-            fcntl.flock(self._fd, fcntl.LOCK_UN)
-        except Exception:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        except OSError:
             pass  # Best effort
-        
-        try:
-            os.close(self._fd)
-        except Exception:
-            pass  # Best effort
-        
-        self._fd = None
-        self.acquired = False
+        finally:
+            try:
+                os.close(fd)
+            except OSError:
+                pass  # Best effort
 
     def __enter__(self) -> SingleInstanceLock:
         """Context manager entry: acquire the lock."""
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 import time
 from dataclasses import dataclass
 from typing import Callable
@@ -14,17 +15,15 @@ class RepeatGate:
 
     min_interval_sec: float = 0.15
     time_fn: Callable[[], float] = time.monotonic
-    _last_allowed: float | None = None
+    # Earliest time the next press is allowed; -inf so the first press always passes.
+    _next_allowed_at: float = -math.inf
 
     def allow(self) -> bool:
-        now = float(self.time_fn())
-        if self._last_allowed is None:
-            self._last_allowed = now
-            return True
-        if (now - self._last_allowed) >= float(self.min_interval_sec):
-            self._last_allowed = now
-            return True
-        return False
+        now = self.time_fn()
+        if now < self._next_allowed_at:
+            return False
+        self._next_allowed_at = now + self.min_interval_sec
+        return True
 
 
 class GpioButtons:
@@ -6,6 +6,30 @@ from dataclasses import dataclass, field
 
 from .keys import InputEvent
 
+# Key dispatch for the posix parser. Events are immutable, so one instance per key is shared.
+_KEY_TABLE: dict[int, InputEvent] = {
+    ord("q"): InputEvent(kind="quit"),
+    ord("Q"): InputEvent(kind="quit"),
+    ord("r"): InputEvent(kind="reset_all"),
+    ord("R"): InputEvent(kind="reset_all"),
+}
+
+# Recognized escape sequences:
+# - Up:    ESC [ A
+# - Down:  ESC [ B
+# - PgUp:  ESC [ 5 ~
+# - PgDn:  ESC [ 6 ~
+_CSI_TABLE: dict[bytes, InputEvent] = {
+    b"\x1b[A": InputEvent(kind="channel_up"),
+    b"\x1b[B": InputEvent(kind="channel_down"),
+    b"\x1b[5~": InputEvent(kind="channel_up"),
+    b"\x1b[6~": InputEvent(kind="channel_down"),
+}
+_CSI_MAX_LEN = max(map(len, _CSI_TABLE))
+
+# Proper prefixes of known sequences: a buffer holding only one of these is incomplete.
+_CSI_PREFIXES = frozenset(seq[:i] for seq in _CSI_TABLE for i in range(1, len(seq)))
+
 
 @dataclass
 class KeyboardInput:
@@ -118,76 +142,54 @@ class KeyboardInput:
         self._posix_buf.extend(data)
 
         # Defensive: prevent unbounded buffer growth from unrecognized sequences.
-        # Keep only the most recent bytes if buffer exceeds max size.
+        # Keep only the most recent bytes if buffer exceeds max size (trimmed in place so
+        # the same bytearray is reused for the lifetime of the provider).
         if len(self._posix_buf) > self._posix_buf_max_size:
-            self._posix_buf = self._posix_buf[-self._posix_buf_max_size:]
-
-        # Parse buffer for known sequences.
-        # Common escape sequences:
-        # - Up:    ESC [ A
-        # - Down:  ESC [ B
-        # - PgUp:  ESC [ 5 ~
-        # - PgDn:  ESC [ 6 ~
-        #
+            del self._posix_buf[:-self._posix_buf_max_size]
+
+        return self._parse_posix_buf()
+
+    def _parse_posix_buf(self) -> InputEvent | None:
+        """Consume buffered bytes up to and including the first recognized key."""
+        buf = self._posix_buf
+
         # CRITICAL FIX: Limit loop iterations to prevent O(n^2) behavior when buffer
         # contains many unrecognized bytes. Process at most 32 bytes per poll() call.
         max_iterations = 32
         iterations = 0
         
-        while self._posix_buf and iterations < max_iterations:
+        while buf and iterations < max_iterations:
             iterations += 1
-            b0 = self._posix_buf[0]
+            b0 = buf[0]
 
             # Normal char.
-            if b0 in (ord("q"), ord("Q")):
-                del self._posix_buf[0]
-                return InputEvent(kind="quit")
-            if b0 in (ord("r"), ord("R")):
-                del self._posix_buf[0]
-                return InputEvent(kind="reset_all")
-
-            # ESC-sequence.
+            event = _KEY_TABLE.get(b0)
+            if event is not None:
+                del buf[0]
+                return event
+
+            # ESC-sequence: look up the 3- and 4-byte heads in the dispatch table.
             if b0 == 0x1B:
-                if len(self._posix_buf) < 2:
+                head = bytes(buf[:_CSI_MAX_LEN])
+                for n in (3, 4):
+                    event = _CSI_TABLE.get(head[:n])
+                    if event is not None:
+                        del buf[:n]
+                        return event
+                if head in _CSI_PREFIXES:
                     # Incomplete sequence; wait for more data on next poll.
                     return None
-                if self._posix_buf[1] != ord("["):
-                    # Unknown; consume ESC and continue.
-                    del self._posix_buf[0]
-                    continue
-                if len(self._posix_buf) < 3:
-                    # Incomplete CSI sequence; wait for more data on next poll.
-                    return None
 
-                b2 = self._posix_buf[2]
-
-                # Arrow keys.
-                if b2 == ord("A"):
-                    del self._posix_buf[:3]
-                    return InputEvent(kind="channel_up")
-                if b2 == ord("B"):
-                    del self._posix_buf[:3]
-                    return InputEvent(kind="channel_down")
-
-                # PageUp/PageDown.
-                if b2 in (ord("5"), ord("6")):
-                    if len(self._posix_buf) < 4:
-                        # Incomplete sequence; wait for more data on next poll.
-                        return None
-                    if self._posix_buf[3] == ord("~"):
-                        del self._posix_buf[:4]
-                        return InputEvent(kind="channel_up" if b2 == ord("5") else "channel_down")
-
-                # Unknown CSI; consume ESC and retry.
-                del self._posix_buf[0]
+                # Unknown sequence; consume ESC and retry.
+                del buf[0]
                 continue
 
             # Unhandled byte; consume.
-            del self._posix_buf[0]
+            del buf[0]
 
         # CRITICAL FIX: If we've processed max_iterations without finding a valid event,
         # and the buffer still has data, it's likely garbage. Clear it to prevent accumulation.
-        if iterations >= max_iterations and len(self._posix_buf) > 0:
-            self._posix_buf.clear()
+        if iterations >= max_iterations and buf:
+            buf.clear()
 
         return None
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
 import os
+import select
+import socket
+import stat
+import struct
+import sys
 import time
+from functools import lru_cache
 from pathlib import Path
 import subprocess
 from dataclasses import dataclass, field
@@ -11,6 +17,89 @@ from typing import Any, Callable
 from .mpv_ipc import MpvIpcClient, MpvIpcError
 
 
+# inotify constants (linux/inotify.h); IN_NONBLOCK/IN_CLOEXEC share the O_* values.
+_IN_CREATE = 0x00000100
+_IN_MOVED_TO = 0x00000080
+_INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (name follows)
+
+# Polling fallback: first sleep, growth factor per miss (capped at poll_interval_sec).
+_POLL_FIRST_INTERVAL_SEC = 0.0005
+_POLL_BACKOFF = 1.5
+
+
+def _fast_exists(path: Path) -> bool:
+    """Existence probe used while waiting: a single os.stat (same answers as os.path.exists)."""
+    try:
+        os.stat(path)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+@lru_cache(maxsize=1)
+def _inotify_libc() -> Any | None:
+    """libc with inotify bindings, or None where inotify is unavailable (non-Linux)."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except (ImportError, OSError):
+        return None
+    if not (hasattr(libc, "inotify_init1") and hasattr(libc, "inotify_add_watch")):
+        return None
+    return libc
+
+
+def _wait_for_path_inotify(path: Path, timeout_sec: float) -> bool | None:
+    """Wait for path to be created using an inotify watch on its parent directory.
+
+    Returns True/False like _wait_for_path_exists, or None if inotify could not be
+    set up (caller falls back to polling).
+    """
+    libc = _inotify_libc()
+    if libc is None:
+        return None
+
+    fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        return None
+    try:
+        parent = os.fsencode(path.parent)
+        if libc.inotify_add_watch(fd, parent, _IN_CREATE | _IN_MOVED_TO) < 0:
+            return None
+
+        # The path may have appeared before the watch was armed.
+        if _fast_exists(path):
+            return True
+
+        target = os.fsencode(path.name)
+        deadline = time.monotonic() + float(timeout_sec)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return _fast_exists(path)
+            ready, _w, _x = select.select([fd], [], [], remaining)
+            if not ready:
+                return _fast_exists(path)
+            try:
+                data = os.read(fd, 4096)
+            except BlockingIOError:
+                continue
+
+            offset = 0
+            while offset < len(data):
+                _wd, _mask, _cookie, name_len = _INOTIFY_EVENT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT.size
+                if data[offset:offset + name_len].rstrip(b"\0") == target:
+                    return True
+                offset += name_len
+    finally:
+        os.close(fd)
+
+
 def _wait_for_path_exists(
     path: Path,
     *,
@@ -18,32 +107,123 @@ def _wait_for_path_exists(
     poll_interval_sec: float = 0.02,
     exists_fn: Callable[[Path], bool] | None = None,
     time_fn: Callable[[], float] | None = None,
+    use_inotify: bool = True,
 ) -> bool:
     """Wait for a filesystem path to exist, with timeout.
 
     Returns True if the path exists within the timeout, False otherwise.
 
+    On Linux the wait is event-driven (inotify), so the caller wakes as soon as the
+    path is created. Polling is used elsewhere, when inotify cannot be set up, or
+    when exists_fn/time_fn are overridden.
+
     Args:
         path: The path to wait for.
         timeout_sec: Maximum time to wait (seconds).
-        poll_interval_sec: How often to check for existence.
-        exists_fn: Override for path.exists() (for testing).
+        poll_interval_sec: Longest sleep between existence checks (polling only).
+        exists_fn: Override for the existence probe (for testing).
         time_fn: Override for time.time() (for testing).
+        use_inotify: Set False to force the polling loop.
     """
+    event_driven = use_inotify and exists_fn is None and time_fn is None
     if exists_fn is None:
-        def exists_fn(p: Path) -> bool:
-            return p.exists()
+        exists_fn = _fast_exists
+
+    # Fast path: already there (the usual case once mpv is up). No clock reads, no watch.
+    if exists_fn(path):
+        return True
+
+    if event_driven:
+        result = _wait_for_path_inotify(path, timeout_sec)
+        if result is not None:
+            return result
+
     if time_fn is None:
         time_fn = time.time
 
     deadline = time_fn() + float(timeout_sec)
-    while time_fn() < deadline:
-        if exists_fn(path):
+    return _poll_until(lambda: exists_fn(path), deadline, poll_interval_sec, time_fn)
+
+
+def _poll_until(
+    probe: Callable[[], bool],
+    deadline: float,
+    poll_interval_sec: float,
+    time_fn: Callable[[], float],
+) -> bool:
+    """Call probe() with backoff sleeps until it returns True or time_fn() reaches deadline."""
+    sleep = time.sleep
+    # Back off from a short first sleep so a condition met right away is seen quickly,
+    # while long waits settle at poll_interval_sec.
+    max_interval = max(0.0, float(poll_interval_sec))
+    interval = min(_POLL_FIRST_INTERVAL_SEC, max_interval)
+
+    # One clock read per iteration; the last sleep stops at the deadline instead of past it.
+    now = time_fn()
+    while now < deadline:
+        sleep(min(interval, deadline - now))
+        interval = min(interval * _POLL_BACKOFF, max_interval)
+        if probe():
             return True
-        time.sleep(max(0.0, float(poll_interval_sec)))
+        now = time_fn()
 
     # Final check at deadline
-    return exists_fn(path)
+    return probe()
+
+
+def _unix_socket_accepts(path: Path) -> bool:
+    """Connect probe used while waiting: True if a listener accepts on the UNIX socket path."""
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        s.settimeout(0.25)
+        s.connect(os.fspath(path))
+    except OSError:
+        return False
+    finally:
+        s.close()
+    return True
+
+
+def _wait_for_socket_connectable(
+    path: Path,
+    *,
+    timeout_sec: float = 2.0,
+    poll_interval_sec: float = 0.02,
+    connect_fn: Callable[[Path], bool] | None = None,
+    time_fn: Callable[[], float] | None = None,
+) -> bool:
+    """Wait for a UNIX socket to accept connections, with timeout.
+
+    Returns True once a connect() succeeds within the timeout, False otherwise.
+
+    mpv creates the socket file before it listen()s on it, so existence alone can
+    report ready too early. This waits for the file (event-driven where possible,
+    see _wait_for_path_exists), then retries connect() with the same backoff.
+
+    Args:
+        path: The socket path to wait for.
+        timeout_sec: Maximum time to wait (seconds).
+        poll_interval_sec: Longest sleep between connect attempts.
+        connect_fn: Override for the connect probe (for testing).
+        time_fn: Override for time.time() (for testing).
+    """
+    wait_for_file = connect_fn is None and time_fn is None
+    if connect_fn is None:
+        connect_fn = _unix_socket_accepts
+
+    if connect_fn(path):
+        return True
+
+    if time_fn is None:
+        time_fn = time.time
+
+    deadline = time_fn() + float(timeout_sec)
+    # Every connect() fails with ENOENT until mpv creates the file; sleep through that part.
+    if wait_for_file and not _wait_for_path_exists(
+        path, timeout_sec=timeout_sec, poll_interval_sec=poll_interval_sec
+    ):
+        return False
+    return _poll_until(lambda: connect_fn(path), deadline, poll_interval_sec, time_fn)
 
 
 @dataclass
@@ -657,7 +837,6 @@ class MpvPlayer:
             if p.exists():
                 # Verify it's actually a socket before trying to remove it.
                 # Use stat to check the file type.
-                import stat
                 st = p.stat()
                 if stat.S_ISSOCK(st.st_mode):
                     # It's a socket; safe to remove.
@@ -731,52 +910,46 @@ class MpvPlayer:
             text=True,
         )
 
-        # On non-Windows, wait for mpv to create the IPC socket before attempting to connect.
-        # This avoids a race condition on first launch where the IPC client tries to connect
-        # before mpv has bound the socket.
+        # On non-Windows, wait for mpv to accept connections on the IPC socket before
+        # handing it to the IPC client. The socket file can exist before mpv listens on
+        # it, so waiting on the file alone races on first launch.
         # Use a longer timeout (10s) to accommodate slower startup during boot/auto-login scenarios
         # where the display server and graphics subsystem may still be initializing.
         if os.name != "nt":
             pipe_path_obj = Path(self.pipe_path)
+            ipc_timeout_sec = 10.0
             if self.debug:
                 print(f"[debug] mpv: waiting for IPC socket: {self.pipe_path}")
-            
-            socket_exists = _wait_for_path_exists(pipe_path_obj, timeout_sec=10.0, poll_interval_sec=0.05)
-            
-            if not socket_exists:
-                # Socket didn't appear in time. Check if mpv process is still alive.
+
+            socket_ready = _wait_for_socket_connectable(
+                pipe_path_obj, timeout_sec=ipc_timeout_sec, poll_interval_sec=0.05
+            )
+
+            if not socket_ready:
+                # Socket didn't become connectable in time. Check if mpv process is still alive.
                 proc_status = self._proc.poll()
+                try:
+                    not_a_socket = not stat.S_ISSOCK(os.stat(pipe_path_obj).st_mode)
+                except OSError:
+                    not_a_socket = False
                 if proc_status is not None:
                     err_msg = (
                         f"mpv process exited (code={proc_status}) before creating IPC socket '{self.pipe_path}'. "
                         f"Check mpv installation and logs."
                     )
-                else:
+                elif not_a_socket:
                     err_msg = (
-                        f"Timed out waiting for mpv to create IPC socket '{self.pipe_path}'. "
-                        f"mpv process is running (PID={self._proc.pid}) but socket not ready after 2s."
-                    )
-                raise MpvIpcError(err_msg)
-            
-            # Socket file exists, but mpv may not have finished binding to it yet.
-            # Verify it's actually a socket and add a grace period.
-            try:
-                import stat
-                st = pipe_path_obj.stat()
-                if not stat.S_ISSOCK(st.st_mode):
-                    raise MpvIpcError(
                         f"IPC path '{self.pipe_path}' exists but is not a socket. "
                         f"This may indicate a configuration or filesystem issue."
                     )
-            except OSError as e:
-                if self.debug:
-                    print(f"[debug] mpv: warning - could not verify socket type: {e}")
-                # Continue anyway; connection attempt will fail if there's a real problem.
-            
-            # Add a small grace period to ensure mpv is fully ready to accept connections.
-            # This prevents "Permission denied" errors during connection attempts.
-            time.sleep(0.1)
-            
+                else:
+                    err_msg = (
+                        f"Timed out waiting for mpv to accept connections on IPC socket '{self.pipe_path}'. "
+                        f"mpv process is running (PID={self._proc.pid}) but socket not ready after "
+                        f"{ipc_timeout_sec:g}s."
+                    )
+                raise MpvIpcError(err_msg)
+
             if self.debug:
                 print("[debug] mpv: IPC socket ready")
 
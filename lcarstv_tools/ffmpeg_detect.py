@@ -4,10 +4,16 @@ from __future__ import annotations
 
 import re
 import subprocess
+from collections.abc import Iterator
 from pathlib import Path
 
 from .types import Segment
 
+# Compiled once at import; parsers run on every processed file.
+_BLACK_RE = re.compile(r"black_start:(\d+\.?\d*)\s+black_end:(\d+\.?\d*)")
+# Matches both silence events (group 1: "start"/"end"); handles negatives and decimals
+_SILENCE_RE = re.compile(r"silence_(start|end):\s*(-?\d+(?:\.\d+)?)")
+
 
 def check_ffmpeg_available() -> tuple[bool, str]:
     """Check if ffmpeg and ffprobe are available in PATH.
@@ -113,20 +119,20 @@ def parse_black_segments(stderr: str) -> list[Segment]:
     Returns:
         List of Segment objects
     """
-    segments: list[Segment] = []
-    # Pattern to match black_start and black_end
-    pattern = r"black_start:(\d+\.?\d*)\s+black_end:(\d+\.?\d*)"
-    
-    for match in re.finditer(pattern, stderr):
-        try:
-            start = float(match.group(1))
-            end = float(match.group(2))
-            if end > start:
-                segments.append(Segment(start=start, end=end))
-        except (ValueError, IndexError):
-            continue
+    return list(iter_black_segments(stderr))
+
+
+def iter_black_segments(stderr: str) -> Iterator[Segment]:
+    """Lazily yield black segments from ffmpeg stderr in output order.
     
-    return segments
+    See parse_black_segments for the expected line format.
+    """
+    # The pattern only matches well-formed decimals, so float() cannot fail
+    for match in _BLACK_RE.finditer(stderr):
+        start = float(match.group(1))
+        end = float(match.group(2))
+        if end > start:
+            yield Segment(start=start, end=end)
 
 
 def detect_silence_segments(
@@ -169,6 +175,54 @@ def detect_silence_segments(
         return []
 
 
+def detect_black_and_silence(
+    file_path: Path,
+    black_min_duration: float,
+    black_threshold: float,
+    silence_min_duration: float,
+    silence_noise_db: float,
+) -> tuple[list[Segment], list[Segment]]:
+    """Detect black and silence segments with a single ffmpeg pass.
+    
+    Runs blackdetect on the video stream and silencedetect on the audio stream in
+    the same invocation, so the file is demuxed and decoded once instead of twice.
+    
+    Args:
+        file_path: Path to media file
+        black_min_duration: Minimum duration in seconds (d parameter)
+        black_threshold: Black picture ratio threshold (pic_th parameter)
+        silence_min_duration: Minimum silence duration in seconds
+        silence_noise_db: Noise threshold in dB
+    
+    Returns:
+        (black segments, silence segments)
+    """
+    try:
+        result = subprocess.run(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-nostats",
+                "-i", str(file_path),
+                "-vf", f"blackdetect=d={black_min_duration}:pic_th={black_threshold}",
+                "-af", f"silencedetect=noise={silence_noise_db}dB:d={silence_min_duration}",
+                "-f", "null",
+                "-",
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=600,  # 10 minutes max
+        )
+        
+        # Each parser only matches its own filter's lines in the combined log
+        return parse_black_segments(result.stderr), parse_silence_segments(result.stderr)
+    except subprocess.TimeoutExpired:
+        return [], []
+    except Exception:
+        return [], []
+
+
 def parse_silence_segments(stderr: str) -> list[Segment]:
     """Parse silencedetect output from ffmpeg stderr.
     
@@ -182,37 +236,25 @@ def parse_silence_segments(stderr: str) -> list[Segment]:
     Returns:
         List of Segment objects
     """
-    segments: list[Segment] = []
-    
-    # Robust regex patterns that handle negatives and decimals
-    start_pattern = r"silence_start:\s*(-?\d+(?:\.\d+)?)"
-    end_pattern = r"silence_end:\s*(-?\d+(?:\.\d+)?)"
+    return list(iter_silence_segments(stderr))
+
+
+def iter_silence_segments(stderr: str) -> Iterator[Segment]:
+    """Lazily yield silence segments from ffmpeg stderr in output order.
     
+    See parse_silence_segments for the expected line format.
+    """
     # State machine: track current silence start
     current_start: float | None = None
     
-    # Process stderr line by line to maintain order
-    for line in stderr.split('\n'):
-        # Check for silence_start
-        start_match = re.search(start_pattern, line)
-        if start_match:
-            try:
-                current_start = float(start_match.group(1))
-            except ValueError:
-                pass
-            continue
-        
-        # Check for silence_end (must follow a start)
-        end_match = re.search(end_pattern, line)
-        if end_match and current_start is not None:
-            try:
-                end = float(end_match.group(1))
-                # Only create segment if end > start (valid segment)
-                if end > current_start:
-                    segments.append(Segment(start=current_start, end=end))
-                # Reset state after pairing
-                current_start = None
-            except ValueError:
-                pass
-    
-    return segments
+    # Scan the whole log in one pass; events arrive in output order
+    for match in _SILENCE_RE.finditer(stderr):
+        value = float(match.group(2))
+        if match.group(1) == "start":
+            current_start = value
+        elif current_start is not None:
+            # silence_end must follow a start; only create segment if end > start
+            if value > current_start:
+                yield Segment(start=current_start, end=value)
+            # Reset state after pairing
+            current_start = None
@@ -4,11 +4,25 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from itertools import accumulate, islice, pairwise
+from operator import attrgetter
 from pathlib import Path
+from typing import Any, TypeVar
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional; stdlib json is used instead
+    orjson = None
 
 from . import ffmpeg_detect
-from .types import BreakWindow, Segment
+from .types import BreakWindow, Segment, SegmentArray
+
+_TimedT = TypeVar("_TimedT", Segment, BreakWindow)
 
 
 def seconds_to_timecode(seconds: float) -> str:
@@ -26,8 +40,19 @@ def seconds_to_timecode(seconds: float) -> str:
     return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
 
 
+def _sorted_by_start(windows: list[_TimedT]) -> list[_TimedT]:
+    """Return windows ordered by start time, skipping the sort if already ordered.
+    
+    ffmpeg reports detections in time order and create_break_windows preserves
+    that order, so the usual case is a single linear check instead of a sort.
+    """
+    if all(a.start <= b.start for a, b in pairwise(windows)):
+        return windows
+    return sorted(windows, key=lambda w: w.start)
+
+
 def create_break_windows(
-    black_segments: list[Segment],
+    black_segments: Iterable[Segment],
     silence_segments: list[Segment],
     require_silence: bool,
 ) -> list[BreakWindow]:
@@ -41,25 +66,141 @@ def create_break_windows(
     Returns:
         List of break windows
     """
-    windows: list[BreakWindow] = []
+    return list(iter_break_windows(black_segments, silence_segments, require_silence))
+
+
+def iter_break_windows(
+    black_segments: Iterable[Segment],
+    silence_segments: list[Segment],
+    require_silence: bool,
+) -> Iterator[BreakWindow]:
+    """Lazily yield break windows in the same order as create_break_windows.
     
+    Lets callers filter each window as it is produced instead of
+    materializing the full candidate list first.
+    """
     if not require_silence:
         # Blackdetect-only mode: convert black segments directly to break windows
         for black in black_segments:
             if black.end > black.start:
-                windows.append(BreakWindow(start=black.start, end=black.end))
+                yield BreakWindow(start=black.start, end=black.end)
     else:
-        # Require overlap with silence segments
+        black_segments = list(black_segments)
+        if _is_disjoint_ordered(black_segments) and _is_disjoint_ordered(silence_segments):
+            # Normal ffmpeg output: one merge-style walk over both lists
+            yield from _iter_sweep_overlaps(black_segments, silence_segments)
+            return
+        
+        # Require overlap with silence segments (indexed, so each black segment
+        # only visits silences that can overlap it)
+        index = _build_index(silence_segments)
         for black in black_segments:
-            for silence in silence_segments:
-                overlap_start = max(black.start, silence.start)
-                overlap_end = min(black.end, silence.end)
+            for silence_start, silence_end in _iter_overlapping(index, black.start, black.end):
+                overlap_start = max(black.start, silence_start)
+                overlap_end = min(black.end, silence_end)
                 
                 # Only accept actual overlaps
                 if overlap_end > overlap_start:
-                    windows.append(BreakWindow(start=overlap_start, end=overlap_end))
+                    yield BreakWindow(start=overlap_start, end=overlap_end)
+
+
+def _is_disjoint_ordered(windows: list[_TimedT]) -> bool:
+    """Return True if windows are sorted by start and do not overlap each other."""
+    return all(a.end <= b.start for a, b in pairwise(windows))
+
+
+def _iter_sweep_overlaps(
+    black_segments: list[Segment], silence_segments: list[Segment]
+) -> Iterator[BreakWindow]:
+    """Yield black/silence overlaps with a two-pointer walk in O(N + M).
+    
+    Both lists must be sorted and internally disjoint. Whichever current segment
+    ends first cannot overlap anything later in the other list, so it is the one
+    advanced. Output order matches the indexed path.
+    """
+    bi = si = 0
+    n_black, n_silence = len(black_segments), len(silence_segments)
+    while bi < n_black and si < n_silence:
+        black = black_segments[bi]
+        silence = silence_segments[si]
+        overlap_start = max(black.start, silence.start)
+        overlap_end = min(black.end, silence.end)
+        if overlap_end > overlap_start:
+            yield BreakWindow(start=overlap_start, end=overlap_end)
+        if black.end < silence.end:
+            bi += 1
+        else:
+            si += 1
+
+
+_SegmentIndex = tuple[SegmentArray, "array[float]"]
+
+
+def _build_index(segments: list[Segment]) -> _SegmentIndex:
+    """Build a static overlap index over segments.
+    
+    Segments are stored sorted by start in a SegmentArray, alongside the running
+    maximum of end times. Starts and max ends are both non-decreasing, so the
+    candidate range for any query interval can be found by binary search.
+    """
+    ordered = SegmentArray.from_segments(_sorted_by_start(segments))
+    max_ends = array("d", accumulate(ordered.ends, max))
+    return ordered, max_ends
+
+
+def _iter_overlapping(
+    index: _SegmentIndex, start: float, end: float
+) -> Iterator[tuple[float, float]]:
+    """Yield (start, end) of indexed segments overlapping (start, end), in start order.
+    
+    Segments before lo all end at or before start; segments from hi on start at or
+    after end. For disjoint segments (normal ffmpeg output) everything in between
+    overlaps; otherwise a few extra candidates may be yielded and are rejected by
+    the caller's overlap check.
+    """
+    ordered, max_ends = index
+    lo = bisect_right(max_ends, start)
+    hi = bisect_left(ordered.starts, end)
+    starts, ends = ordered.starts, ordered.ends
+    for i in range(lo, hi):
+        yield starts[i], ends[i]
+
+
+def collect_candidate_windows(
+    windows: Iterable[BreakWindow],
+    exclude_seconds: float,
+    duration: float,
+    max_duration: float | None,
+) -> tuple[list[BreakWindow], int, int]:
+    """Apply the max-duration and edge filters to a window stream in one pass.
+    
+    Equivalent to filter_windows_by_max_duration followed by filter_edge_regions,
+    but each window is discarded as soon as it is produced.
+    
+    Args:
+        windows: Break windows (typically from iter_break_windows)
+        exclude_seconds: Seconds to exclude from start and end
+        duration: Total duration of media file
+        max_duration: Optional maximum window duration in seconds
     
-    return windows
+    Returns:
+        (kept windows, number of input windows, number removed by max duration)
+    """
+    kept: list[BreakWindow] = []
+    total = 0
+    too_long = 0
+    edge_end = duration - exclude_seconds
+    
+    for window in windows:
+        total += 1
+        if max_duration is not None and window.end - window.start > max_duration:
+            too_long += 1
+            continue
+        if window.start < exclude_seconds or window.end > edge_end:
+            continue
+        kept.append(window)
+    
+    return kept, total, too_long
 
 
 def filter_edge_regions(
@@ -77,6 +218,13 @@ def filter_edge_regions(
     Returns:
         Filtered list of break windows
     """
+    if _is_disjoint_ordered(windows):
+        # Ordered, non-overlapping windows (the normal ffmpeg case) have both starts
+        # and ends ascending, so the survivors are one contiguous run: binary search it.
+        lo = bisect_left(windows, exclude_seconds, key=attrgetter("start"))
+        hi = bisect_right(windows, duration - exclude_seconds, key=attrgetter("end"))
+        return windows[lo:hi]
+    
     filtered: list[BreakWindow] = []
     
     for window in windows:
@@ -108,21 +256,29 @@ def merge_nearby_windows(
     if not windows:
         return []
     
-    # Sort by start time
-    sorted_windows = sorted(windows, key=lambda w: w.start)
+    # Sort by start time (no-op for already ordered input)
+    sorted_windows = _sorted_by_start(windows)
+    
+    merged: list[BreakWindow] = []
     
-    merged: list[BreakWindow] = [sorted_windows[0]]
+    # Track the current cluster as plain floats; build one BreakWindow per cluster
+    head = sorted_windows[0]
+    cur_start, cur_end = head.start, head.end
     
-    for window in sorted_windows[1:]:
-        last = merged[-1]
-        gap = window.start - last.end
+    for window in islice(sorted_windows, 1, None):
+        gap = window.start - cur_end
         
         if gap <= merge_gap_seconds:
-            # Merge: extend the last window to include this one
-            merged[-1] = BreakWindow(start=last.start, end=max(last.end, window.end))
+            # Merge: extend the current cluster to include this one
+            if window.end > cur_end:
+                cur_end = window.end
         else:
-            # Keep as separate window
-            merged.append(window)
+            # Close the cluster (reuse the original window if nothing was merged in)
+            merged.append(head if cur_end == head.end else BreakWindow(start=cur_start, end=cur_end))
+            head = window
+            cur_start, cur_end = window.start, window.end
+    
+    merged.append(head if cur_end == head.end else BreakWindow(start=cur_start, end=cur_end))
     
     return merged
 
@@ -142,14 +298,7 @@ def filter_windows_by_max_duration(
     Returns:
         Filtered list with only windows <= max_duration
     """
-    filtered: list[BreakWindow] = []
-    
-    for window in windows:
-        duration = window.end - window.start
-        if duration <= max_duration:
-            filtered.append(window)
-    
-    return filtered
+    return [w for w in windows if w.end - w.start <= max_duration]
 
 
 def filter_min_duration(
@@ -172,35 +321,81 @@ def filter_min_duration(
     Returns:
         Filtered list of break windows
     """
-    filtered: list[BreakWindow] = []
+    # Determine if dual-threshold mode is active (decided once, not per window)
+    if min_duration_after is None or after_seconds is None:
+        # Single threshold mode (current behavior)
+        return [w for w in windows if w.end - w.start >= min_duration]
+    
+    # Dual-threshold: early breaks use the standard threshold, later breaks the lenient one
+    return [
+        w
+        for w in windows
+        if w.end - w.start >= (min_duration if w.start < after_seconds else min_duration_after)
+    ]
+
+
+def merge_and_filter_windows(
+    windows: list[BreakWindow],
+    merge_gap_seconds: float,
+    min_duration: float,
+    min_duration_after: float | None = None,
+    after_seconds: float | None = None,
+) -> tuple[list[BreakWindow], int]:
+    """Merge nearby windows and apply the minimum-duration filter in one pass.
     
-    # Determine if dual-threshold mode is active
-    use_dual_threshold = min_duration_after is not None and after_seconds is not None
+    Equivalent to merge_nearby_windows followed by filter_min_duration, but each
+    merged cluster is checked as soon as it closes, so clusters that are too short
+    never become BreakWindow objects and no intermediate list is built.
     
-    for window in windows:
-        duration = window.end - window.start
-        
-        if use_dual_threshold:
-            # Dual-threshold: apply different minimums based on start time
-            if window.start < after_seconds:
-                # Early break: use standard threshold
-                if duration >= min_duration:
-                    filtered.append(window)
-            else:
-                # Later break: use lenient threshold
-                if duration >= min_duration_after:
-                    filtered.append(window)
+    Args:
+        windows: List of break windows (will be sorted)
+        merge_gap_seconds: Maximum gap between windows to merge
+        min_duration: Minimum duration in seconds (for all breaks, or early breaks if dual-threshold)
+        min_duration_after: Optional minimum duration for breaks starting after threshold
+        after_seconds: Optional time threshold in seconds
+    
+    Returns:
+        (filtered windows, number of windows after merging)
+    """
+    if not windows:
+        return [], 0
+    
+    use_dual_threshold = min_duration_after is not None and after_seconds is not None
+    kept: list[BreakWindow] = []
+    merged_count = 0
+    
+    def close(head: BreakWindow, start: float, end: float) -> None:
+        nonlocal merged_count
+        merged_count += 1
+        if use_dual_threshold and start >= after_seconds:
+            threshold = min_duration_after
+        else:
+            threshold = min_duration
+        if end - start >= threshold:
+            kept.append(head if end == head.end else BreakWindow(start=start, end=end))
+    
+    sorted_windows = _sorted_by_start(windows)
+    head = sorted_windows[0]
+    cur_start, cur_end = head.start, head.end
+    
+    for window in islice(sorted_windows, 1, None):
+        if window.start - cur_end <= merge_gap_seconds:
+            if window.end > cur_end:
+                cur_end = window.end
         else:
-            # Single threshold mode (current behavior)
-            if duration >= min_duration:
-                filtered.append(window)
+            close(head, cur_start, cur_end)
+            head = window
+            cur_start, cur_end = window.start, window.end
     
-    return filtered
+    close(head, cur_start, cur_end)
+    
+    return kept, merged_count
 
 
 def merge_breaks_by_gap(
     breaks: list[BreakWindow],
     min_gap_seconds: float,
+    max_duration: float | None = None,
 ) -> list[BreakWindow]:
     """Merge breaks that are too close together.
     
@@ -208,31 +403,49 @@ def merge_breaks_by_gap(
     min_gap_seconds, merge them into a single break. This is useful for collapsing
     noisy clusters of detections into logical breaks.
     
+    With max_duration set, a merge that would grow a break beyond max_duration is
+    not performed (the next break starts a new cluster instead), and breaks that
+    already exceed it on their own are dropped. The result then never contains
+    runaway windows, so no separate max-duration pass is needed afterwards.
+    
     Args:
         breaks: List of break windows
         min_gap_seconds: Minimum gap required between breaks (seconds)
+        max_duration: Optional maximum duration of a merged break (seconds)
     
     Returns:
         Merged list of break windows
     """
-    if not breaks:
+    # Sort by start time (no-op for already ordered input)
+    sorted_breaks = _sorted_by_start(breaks)
+    
+    if max_duration is not None:
+        sorted_breaks = [b for b in sorted_breaks if b.end - b.start <= max_duration]
+    
+    if not sorted_breaks:
         return []
     
-    # Sort by start time
-    sorted_breaks = sorted(breaks, key=lambda b: b.start)
+    merged: list[BreakWindow] = []
     
-    merged: list[BreakWindow] = [sorted_breaks[0]]
+    # Track the current cluster as plain floats; build one BreakWindow per cluster
+    head = sorted_breaks[0]
+    cur_start, cur_end = head.start, head.end
     
-    for current in sorted_breaks[1:]:
-        previous = merged[-1]
-        gap = current.start - previous.end
+    for current in islice(sorted_breaks, 1, None):
+        gap = current.start - cur_end
+        new_end = current.end if current.end > cur_end else cur_end
         
-        if gap < min_gap_seconds:
-            # Merge: extend previous break to include current
-            merged[-1] = BreakWindow(start=previous.start, end=max(previous.end, current.end))
+        if gap < min_gap_seconds and (max_duration is None or new_end - cur_start <= max_duration):
+            # Merge: extend the current cluster to include this break
+            cur_end = new_end
         else:
-            # Gap is sufficient, keep as separate break
-            merged.append(current)
+            # Gap is sufficient (or merging would create a runaway window), close the
+            # cluster (reusing the original break if unmerged)
+            merged.append(head if cur_end == head.end else BreakWindow(start=cur_start, end=cur_end))
+            head = current
+            cur_start, cur_end = current.start, current.end
+    
+    merged.append(head if cur_end == head.end else BreakWindow(start=cur_start, end=cur_end))
     
     return merged
 
@@ -266,57 +479,55 @@ def process_file(
     if duration is None:
         return None, "Could not determine duration"
     
-    # Detect black segments (always required)
-    black_segments = ffmpeg_detect.detect_black_segments(
-        file_path,
-        black_min_duration,
-        black_threshold,
-    )
-    
-    if debug:
-        print(f"  [DEBUG] Black segments detected: {len(black_segments)}")
-    
-    # Detect silence segments (only if needed)
     silence_segments: list[Segment] = []
     if require_silence:
-        silence_segments = ffmpeg_detect.detect_silence_segments(
+        # Detect black and silence segments together (one decode of the file)
+        black_segments, silence_segments = ffmpeg_detect.detect_black_and_silence(
             file_path,
+            black_min_duration,
+            black_threshold,
             silence_min_duration,
             silence_noise_db,
         )
-        if debug:
-            print(f"  [DEBUG] Silence segments detected: {len(silence_segments)}")
-    
-    # Create break windows
-    windows = create_break_windows(black_segments, silence_segments, require_silence)
+    else:
+        # Blackdetect-only: video stream alone (audio is not decoded)
+        black_segments = ffmpeg_detect.detect_black_segments(
+            file_path,
+            black_min_duration,
+            black_threshold,
+        )
     
     if debug:
-        print(f"  [DEBUG] Windows after pairing: {len(windows)}")
-    
-    # Filter max duration (must come before merging to catch runaway windows)
-    if max_break_duration is not None:
-        before_count = len(windows)
-        windows = filter_windows_by_max_duration(windows, max_break_duration)
-        removed = before_count - len(windows)
-        if debug:
-            print(f"  [DEBUG] Windows after max-duration filter: {len(windows)} (removed {removed})")
+        print(f"  [DEBUG] Black segments detected: {len(black_segments)}")
+        if require_silence:
+            print(f"  [DEBUG] Silence segments detected: {len(silence_segments)}")
     
-    # Filter edge regions
-    windows = filter_edge_regions(windows, exclude_edge_seconds, duration)
+    # Pair segments into windows, dropping runaway and edge windows as they are produced
+    # (max duration must be checked before merging to catch runaway windows)
+    windows, paired_count, removed = collect_candidate_windows(
+        iter_break_windows(black_segments, silence_segments, require_silence),
+        exclude_edge_seconds,
+        duration,
+        max_break_duration,
+    )
     
     if debug:
+        print(f"  [DEBUG] Windows after pairing: {paired_count}")
+        if max_break_duration is not None:
+            print(f"  [DEBUG] Windows after max-duration filter: {paired_count - removed} (removed {removed})")
         print(f"  [DEBUG] Windows after edge filter: {len(windows)}")
     
-    # Merge nearby windows
-    windows = merge_nearby_windows(windows, merge_gap_seconds)
-    
-    if debug:
-        print(f"  [DEBUG] Windows after merge: {len(windows)}")
-    
-    # Filter minimum duration (with optional dual threshold)
-    windows = filter_min_duration(windows, min_break_duration, min_break_duration_after, after_seconds)
+    # Merge nearby windows and filter minimum duration (with optional dual threshold)
+    windows, merged_count = merge_and_filter_windows(
+        windows,
+        merge_gap_seconds,
+        min_break_duration,
+        min_break_duration_after,
+        after_seconds,
+    )
     
     if debug:
+        print(f"  [DEBUG] Windows after merge: {merged_count}")
         print(f"  [DEBUG] Windows after min-duration filter: {len(windows)}")
     
     # Skip first N breaks if requested
@@ -325,16 +536,16 @@ def process_file(
             print(f"  [DEBUG] Skipping first {skip_first_breaks} break(s)")
         windows = windows[skip_first_breaks:]
     
-    # Merge breaks that are too close together (optional final step)
+    # Merge breaks that are too close together (optional final step). The merge itself
+    # enforces max duration so it never creates runaway windows.
     if min_gap_between_breaks is not None and min_gap_between_breaks > 0:
         if debug:
             print(f"  [DEBUG] Windows before gap-based merge: {len(windows)}")
-        windows = merge_breaks_by_gap(windows, min_gap_between_breaks)
+        windows = merge_breaks_by_gap(windows, min_gap_between_breaks, max_break_duration)
         if debug:
             print(f"  [DEBUG] Windows after gap-based merge: {len(windows)}")
-    
-    # Apply max duration filter again after gap-based merge (catches runaway merged windows)
-    if max_break_duration is not None:
+    elif max_break_duration is not None:
+        # Catch windows that grew past the limit in merge_nearby_windows
         before_count = len(windows)
         windows = filter_windows_by_max_duration(windows, max_break_duration)
         removed = before_count - len(windows)
@@ -353,6 +564,13 @@ def process_file(
     return windows, None
 
 
+def _dump_metadata(metadata: dict[str, Any]) -> bytes:
+    """Serialize metadata as indented UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
+    return json.dumps(metadata, indent=2).encode("utf-8")
+
+
 def write_metadata_json(
     file_path: Path,
     breaks: list[BreakWindow],
@@ -372,45 +590,161 @@ def write_metadata_json(
     }
     
     json_path = file_path.with_suffix(".json")
-    json_content = json.dumps(metadata, indent=2)
+    json_content = _dump_metadata(metadata)
     
     if dry_run:
         print(f"[DRY RUN] Would write {json_path}:")
-        print(json_content)
+        print(json_content.decode("utf-8"))
         print()
     else:
-        json_path.write_text(json_content, encoding="utf-8")
+        json_path.write_bytes(json_content)
+
+
+def _scan_cache_key(directory: Path, extension: str, recursive: bool) -> str:
+    """Build the scan cache key for a (directory, extension, recursive) query."""
+    return f"{directory.resolve()}|{extension}|{int(recursive)}"
+
+
+def _load_scan_cache(cache_path: Path) -> dict[str, dict[str, Any]]:
+    """Load the scan cache, returning an empty mapping if missing or corrupt."""
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    scans = data.get("scans") if isinstance(data, dict) else None
+    return scans if isinstance(scans, dict) else {}
+
+
+def _save_scan_cache(cache_path: Path, scans: dict[str, dict[str, Any]]) -> None:
+    """Write the scan cache atomically (best effort)."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(cache_path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"version": 1, "scans": scans}), encoding="utf-8")
+        tmp.replace(cache_path)
+    except OSError:
+        pass
+
+
+def _scan_cache_valid(entry: Any) -> bool:
+    """Check that every directory recorded in a cache entry is unchanged."""
+    if not isinstance(entry, dict):
+        return False
+    dirs = entry.get("dirs")
+    if not isinstance(dirs, dict) or not dirs or not isinstance(entry.get("files"), list):
+        return False
+    try:
+        return all(os.stat(d).st_mtime_ns == mtime_ns for d, mtime_ns in dirs.items())
+    except OSError:
+        return False
+
+
+def _scan_media_files(
+    directory: Path,
+    ext_with_dot: str,
+    recursive: bool,
+) -> tuple[list[str], dict[str, int]]:
+    """Walk directory for media files.
+    
+    Uses os.scandir directly so file/directory checks come from the cached
+    DirEntry type instead of a separate stat per candidate.
+    
+    Returns:
+        (file paths as strings, mtime_ns of every directory visited)
+    """
+    suffix = os.path.normcase(ext_with_dot)
+    files: list[str] = []
+    dir_mtimes: dict[str, int] = {}
+    stack = [os.fspath(directory)]
+    
+    while stack:
+        current = stack.pop()
+        try:
+            mtime_ns = os.stat(current).st_mtime_ns
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    # Symlinked directories are not followed (matches os.walk / rglob)
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append(entry.path)
+                    elif os.path.normcase(entry.name).endswith(suffix) and entry.is_file():
+                        files.append(entry.path)
+        except OSError:
+            # Unreadable directory; skip it like os.walk does
+            continue
+        dir_mtimes[current] = mtime_ns
+    
+    return files, dir_mtimes
 
 
 def find_media_files(
     directory: Path,
     extension: str,
     recursive: bool,
+    cache_path: Path | None = None,
 ) -> list[Path]:
     """Find all media files in directory.
     
+    When cache_path is given, results are memoized in that JSON file together with
+    the mtime of every scanned directory. A later scan with unchanged directories
+    reuses the cached listing instead of walking the tree again.
+    
     Args:
         directory: Directory to search
         extension: File extension (without dot)
         recursive: Whether to search recursively
+        cache_path: Optional scan cache file (should live outside directory,
+            since writing it would otherwise invalidate the cache)
     
     Returns:
         Sorted list of media file paths
     """
-    ext_with_dot = f".{extension}"
+    scans: dict[str, dict[str, Any]] = {}
+    key = _scan_cache_key(directory, extension, recursive)
     
-    if recursive:
-        files = list(directory.rglob(f"*{ext_with_dot}"))
-    else:
-        files = list(directory.glob(f"*{ext_with_dot}"))
+    if cache_path is not None:
+        scans = _load_scan_cache(cache_path)
+        entry = scans.get(key)
+        if _scan_cache_valid(entry):
+            return [Path(f) for f in entry["files"]]
     
-    # Filter to only files (not directories)
-    files = [f for f in files if f.is_file()]
+    files, dir_mtimes = _scan_media_files(directory, f".{extension}", recursive)
     
     # Sort for deterministic ordering
-    files.sort(key=lambda p: str(p).lower())
+    files.sort(key=str.lower)
+    
+    if cache_path is not None:
+        scans[key] = {"dirs": dir_mtimes, "files": files}
+        _save_scan_cache(cache_path, scans)
+    
+    return [Path(f) for f in files]
+
+
+def _json_sidecar_key(file_path: Path) -> str:
+    """Normalized path of the metadata JSON that belongs to a media file."""
+    return os.path.normcase(os.path.splitext(file_path)[0] + ".json")
+
+
+def _existing_json_sidecars(media_files: list[Path]) -> set[str]:
+    """Collect existing .json files next to the given media files.
+    
+    Lists each containing directory once, so skip decisions need no per-file stat.
+    
+    Returns:
+        Set of normalized paths (compare with _json_sidecar_key)
+    """
+    existing: set[str] = set()
+    
+    for parent in {os.path.dirname(f) for f in media_files}:
+        try:
+            with os.scandir(parent or ".") as entries:
+                for entry in entries:
+                    if os.path.normcase(entry.name).endswith(".json"):
+                        existing.add(os.path.normcase(os.path.join(parent, entry.name)))
+        except OSError:
+            continue
     
-    return files
+    return existing
 
 
 def main() -> int:
@@ -431,6 +765,12 @@ def main() -> int:
         action="store_true",
         help="Recurse into subfolders",
     )
+    parser.add_argument(
+        "--scan-cache",
+        type=Path,
+        default=None,
+        help="Reuse file listings from this JSON cache while directories are unchanged",
+    )
     parser.add_argument(
         "--overwrite",
         action="store_true",
@@ -555,7 +895,7 @@ def main() -> int:
     if args.recursive:
         print("  (recursive mode)")
     
-    media_files = find_media_files(args.path, args.ext, args.recursive)
+    media_files = find_media_files(args.path, args.ext, args.recursive, args.scan_cache)
     
     if not media_files:
         print(f"No .{args.ext} files found.")
@@ -568,11 +908,14 @@ def main() -> int:
     skipped = 0
     failed = 0
     
+    # Existing JSON files, gathered with one directory listing per folder
+    existing_json: set[str] = set()
+    if not args.overwrite and not args.dry_run:
+        existing_json = _existing_json_sidecars(media_files)
+    
     for file_path in media_files:
-        json_path = file_path.with_suffix(".json")
-        
         # Skip if JSON exists and not overwriting
-        if json_path.exists() and not args.overwrite and not args.dry_run:
+        if existing_json and _json_sidecar_key(file_path) in existing_json:
             print(f"SKIP: {file_path.name} (JSON already exists)")
             skipped += 1
             continue
@@ -1,11 +1,19 @@
-"""Data structures for commercial break detection."""
+"""Data structures for commercial break detection.
+
+Invariants (end >= start for Segment, end > start for BreakWindow) are checked with
+assert: the ffmpeg parsers and the pipeline only construct valid values, so the
+checks are stripped under ``python -O``. Code constructing these types from
+untrusted input must validate it first.
+"""
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Segment:
     """A time segment with start and end timestamps in seconds."""
 
@@ -13,21 +21,61 @@ class Segment:
     end: float
 
     def __post_init__(self) -> None:
-        if self.end < self.start:
-            raise ValueError(f"Segment end ({self.end}) must be >= start ({self.start})")
+        assert self.end >= self.start, f"Segment end ({self.end}) must be >= start ({self.start})"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BreakWindow:
-    """A commercial break window with start and end timestamps in seconds."""
+    """A commercial break window with start and end timestamps in seconds.
+
+    Timestamps are rounded to milliseconds on construction (the precision written
+    to JSON), so serialization needs no further work.
+    """
 
     start: float
     end: float
 
     def __post_init__(self) -> None:
-        if self.end <= self.start:
-            raise ValueError(f"BreakWindow end ({self.end}) must be > start ({self.start})")
+        assert self.end > self.start, f"BreakWindow end ({self.end}) must be > start ({self.start})"
+        object.__setattr__(self, "start", round(self.start, 3))
+        object.__setattr__(self, "end", round(self.end, 3))
 
     def to_dict(self) -> dict[str, float]:
         """Convert to dictionary format for JSON serialization."""
-        return {"start": round(self.start, 3), "end": round(self.end, 3)}
+        return {"start": self.start, "end": self.end}
+
+
+@dataclass(slots=True)
+class SegmentArray:
+    """Many segments stored column-wise as two packed float arrays.
+
+    Used inside the detection pipeline where large numbers of segments are scanned;
+    the Segment/BreakWindow dataclasses remain the public API at module boundaries.
+    """
+
+    starts: array[float] = field(default_factory=lambda: array("d"))
+    ends: array[float] = field(default_factory=lambda: array("d"))
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Segment]) -> SegmentArray:
+        """Build from Segment objects, preserving their order."""
+        arr = cls()
+        for seg in segments:
+            arr.append(seg.start, seg.end)
+        return arr
+
+    def append(self, start: float, end: float) -> None:
+        """Add a segment."""
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def iter(self) -> Iterator[tuple[float, float]]:
+        """Iterate (start, end) pairs."""
+        return zip(self.starts, self.ends)
+
+    def to_windows(self) -> list[BreakWindow]:
+        """Convert to BreakWindow objects."""
+        return [BreakWindow(start=s, end=e) for s, e in zip(self.starts, self.ends)]
@@ -94,6 +94,21 @@ def test_max_break_duration_filter():
     assert len(final) == 0, "Runaway merged window should be removed"
     print("  ✓ Successfully caught and removed runaway window created by merging")
     
+    print("\nTest 5: Gap-based merge with max duration never creates runaway windows")
+    capped = merge_breaks_by_gap(short_breaks, 420.0, max_duration=180.0)
+    print(f"  After capped gap-based merge (420s, max 180s): {len(capped)} break(s)")
+    for i, w in enumerate(capped, 1):
+        dur = w.end - w.start
+        print(f"    {i}. {w.start}s - {w.end}s ({dur}s)")
+    
+    # 800-802 cannot absorb 1100-1103 (303s span), but 1100-1103 and 1200-1202 fit (102s)
+    assert len(capped) == 2, f"Expected 2 breaks, got {len(capped)}"
+    assert capped[0] == BreakWindow(start=800.0, end=802.0)
+    assert capped[1] == BreakWindow(start=1100.0, end=1202.0)
+    for window in capped:
+        assert window.end - window.start <= 180.0, f"Window {window} exceeds 180s"
+    print("  ✓ Runaway window was never merged; short breaks preserved")
+    
     print("\n✅ All tests passed!")
 
 if __name__ == "__main__":
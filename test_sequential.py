@@ -1,8 +1,7 @@
 #!/usr/bin/env python3
 """Test script for sequential playthrough functionality."""
 
-from pathlib import Path
-from lcarstv.core.selector import _parse_episode_info, _sort_items_sequentially
+from lcarstv.core.selector import _basename, _parse_episode_info, _sort_items_sequentially
 
 def test_episode_parsing():
     """Test the SxxExx pattern parsing."""
@@ -39,14 +38,14 @@ def test_sequential_sorting():
     
     print("Original order:")
     for i, item in enumerate(test_items, 1):
-        filename = Path(item).name if "/" in item or "\\" in item else item
+        filename = _basename(item)
         print(f"  {i}. {filename}")
     
     sorted_items = _sort_items_sequentially(test_items)
     
     print("\nSorted order:")
     for i, item in enumerate(sorted_items, 1):
-        filename = Path(item).name if "/" in item or "\\" in item else item
+        filename = _basename(item)
         ep_info = _parse_episode_info(item)
         ep_str = f" (S{ep_info[0]:02d}E{ep_info[1]:02d})" if ep_info else " (no episode info)"
         print(f"  {i}. {filename}{ep_str}")
@@ -63,7 +62,7 @@ def test_sequential_sorting():
         "random_special.mkv",
     ]
     
-    actual_order = [Path(item).name for item in sorted_items]
+    actual_order = [_basename(item) for item in sorted_items]
     
     if actual_order == expected_order:
         print("✓ Sorting is correct!")
@@ -89,7 +88,7 @@ def test_wraparound_behavior():
     
     for i in range(5):  # Play through more than once to test wraparound
         index = i % len(sorted_items)
-        filename = Path(sorted_items[index]).name
+        filename = _basename(sorted_items[index])
         print(f"  Pick {i+1}: {filename} (index={index})")
     
     print("\n✓ Wraparound works correctly!")
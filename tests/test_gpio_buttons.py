@@ -37,6 +37,21 @@ class RepeatGateTests(unittest.TestCase):
         clk.advance(0.001)
         self.assertTrue(gate.allow())
 
+    def test_repeat_gate_interval_restarts_from_last_allowed(self) -> None:
+        from lcarstv.input.gpio_buttons import RepeatGate
+
+        clk = FakeClock()
+        gate = RepeatGate(min_interval_sec=0.15, time_fn=clk.now)
+
+        self.assertTrue(gate.allow())
+        clk.advance(1.0)
+        self.assertTrue(gate.allow())
+
+        # Blocked presses do not extend the interval.
+        clk.advance(0.1)
+        self.assertFalse(gate.allow())
+        clk.advance(0.05)
+        self.assertTrue(gate.allow())
 
 if __name__ == "__main__":
     unittest.main()
@@ -87,6 +87,56 @@ def test_incomplete_escape_sequence_preserved():
     # and preserve the buffer for the next poll
 
 
+def test_parse_recognizes_keys_and_sequences():
+    """Verify each mapped key and escape sequence produces its event."""
+    inp = KeyboardInput()
+    cases = [
+        (b"q", "quit"),
+        (b"R", "reset_all"),
+        (b"\x1b[A", "channel_up"),
+        (b"\x1b[B", "channel_down"),
+        (b"\x1b[5~", "channel_up"),
+        (b"\x1b[6~", "channel_down"),
+    ]
+    
+    for data, kind in cases:
+        inp._posix_buf = bytearray(data)
+        assert inp._parse_posix_buf() == InputEvent(kind=kind)
+        assert inp._posix_buf == bytearray()
+
+
+def test_parse_waits_on_incomplete_sequences():
+    """Verify partial escape sequences stay buffered until the rest arrives."""
+    inp = KeyboardInput()
+    
+    for data in (b"\x1b", b"\x1b[", b"\x1b[5"):
+        inp._posix_buf = bytearray(data)
+        assert inp._parse_posix_buf() is None
+        assert inp._posix_buf == bytearray(data)
+    
+    inp._posix_buf.extend(b"~")
+    assert inp._parse_posix_buf() == InputEvent(kind="channel_up")
+
+
+def test_parse_skips_unknown_sequences():
+    """Verify unknown sequences are consumed and following keys still parse."""
+    inp = KeyboardInput()
+    inp._posix_buf = bytearray(b"\x1b[C\x1b[5x\x00\x1b[B q")
+    
+    assert inp._parse_posix_buf() == InputEvent(kind="channel_down")
+    assert inp._posix_buf == bytearray(b" q")
+    assert inp._parse_posix_buf() == InputEvent(kind="quit")
+    assert inp._posix_buf == bytearray()
+
+
+def test_parse_clears_after_max_iterations():
+    """Verify garbage beyond the 32-byte iteration budget is dropped."""
+    inp = KeyboardInput()
+    inp._posix_buf = bytearray([0xFF] * 50)
+    
+    assert inp._parse_posix_buf() is None
+    assert inp._posix_buf == bytearray()
+
 # Integration test concept (requires actual runtime testing):
 def test_long_running_buffer_behavior_description():
     """Document the expected behavior after hours of runtime.
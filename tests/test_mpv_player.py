@@ -1,12 +1,31 @@
 from __future__ import annotations
 
+import socket
+import sys
+import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
+from typing import Callable
+from unittest import mock
+
+from lcarstv.player import mpv_player
+from lcarstv.player.mpv_player import (
+    MpvPlayer,
+    _fast_exists,
+    _unix_socket_accepts,
+    _wait_for_path_exists,
+    _wait_for_path_inotify,
+    _wait_for_socket_connectable,
+)
 
 
 class FakeClock:
     """Mock time source for testing time-based logic."""
 
+    __slots__ = ("t",)
+
     def __init__(self) -> None:
         self.t = 0.0
 
@@ -17,135 +36,228 @@ class FakeClock:
         self.t += float(dt)
 
 
+def _fake_sleep(sleep_fn):
+    """Patch sleeps made by mpv_player only (its module-level `time`), leaving time.sleep alone."""
+    return mock.patch.object(mpv_player, "time", mock.Mock(wraps=time, sleep=sleep_fn))
+
+
 class WaitForPathExistsTests(unittest.TestCase):
     """Test the _wait_for_path_exists helper function."""
 
-    def test_path_exists_immediately(self) -> None:
-        """Path exists on first check - returns immediately."""
-        from lcarstv.player.mpv_player import _wait_for_path_exists
-
+    def _run(
+        self,
+        exists: Callable[[int, float], bool],
+        *,
+        timeout_sec: float,
+        poll_interval_sec: float = 0.02,
+    ) -> tuple[bool, int, float, list[float]]:
+        """Wait on a fake clock; exists(check_number, now) decides when the path appears.
+
+        Returns (result, number of checks, fake time elapsed, sleeps taken).
+        """
         clk = FakeClock()
-        path = Path("/tmp/test.sock")
+        checks = 0
+        sleeps: list[float] = []
 
-        # Fake exists_fn that always returns True
         def exists_fn(p: Path) -> bool:
-            return True
-
-        result = _wait_for_path_exists(
-            path, timeout_sec=2.0, poll_interval_sec=0.02, exists_fn=exists_fn, time_fn=clk.now
-        )
+            nonlocal checks
+            checks += 1
+            return exists(checks, clk.t)
 
-        self.assertTrue(result)
-        # Should not have advanced time (returned immediately)
-        self.assertEqual(clk.t, 0.0)
+        def record_sleep(duration: float) -> None:
+            sleeps.append(duration)
+            clk.advance(duration)
 
-    def test_path_appears_before_timeout(self) -> None:
-        """Path appears after a few checks - returns True."""
-        from lcarstv.player.mpv_player import _wait_for_path_exists
+        with _fake_sleep(record_sleep):
+            result = _wait_for_path_exists(
+                Path("/tmp/test.sock"),
+                timeout_sec=timeout_sec,
+                poll_interval_sec=poll_interval_sec,
+                exists_fn=exists_fn,
+                time_fn=clk.now,
+            )
+        return result, checks, clk.t, sleeps
 
-        clk = FakeClock()
-        path = Path("/tmp/test.sock")
+    def test_path_exists_immediately(self) -> None:
+        """Path exists on first check - returns immediately without sleeping."""
+        result, checks, elapsed, _ = self._run(lambda n, t: True, timeout_sec=2.0)
 
-        check_count = 0
+        self.assertTrue(result)
+        self.assertEqual(checks, 1)
+        self.assertEqual(elapsed, 0.0)
 
-        def exists_fn(p: Path) -> bool:
-            nonlocal check_count
-            check_count += 1
-            # Path appears on the 5th check
-            return check_count >= 5
+    def test_existing_path_skips_clock_and_watch(self) -> None:
+        """An existing path returns before any clock read or inotify setup."""
+        def no_clock() -> float:
+            raise AssertionError("time_fn should not be called")
 
-        # Mock sleep to advance time
-        def mock_sleep(duration: float) -> None:
-            clk.advance(duration)
+        self.assertTrue(
+            _wait_for_path_exists(Path("/tmp/test.sock"), exists_fn=lambda p: True, time_fn=no_clock)
+        )
 
-        # Temporarily replace time.sleep
-        import time
+        with tempfile.NamedTemporaryFile() as tmp, mock.patch.object(
+            mpv_player, "_wait_for_path_inotify"
+        ) as inotify_wait:
+            self.assertTrue(_wait_for_path_exists(Path(tmp.name)))
+        inotify_wait.assert_not_called()
 
-        original_sleep = time.sleep
-        time.sleep = mock_sleep
+    def test_fast_exists_probe(self) -> None:
+        """The default probe reports existence like os.path.exists, without raising."""
+        with tempfile.NamedTemporaryFile() as tmp:
+            self.assertTrue(_fast_exists(Path(tmp.name)))
+            self.assertFalse(_fast_exists(Path(tmp.name + ".missing")))
+            self.assertFalse(_fast_exists(Path(tmp.name) / "not-a-dir"))
 
-        try:
-            result = _wait_for_path_exists(
-                path, timeout_sec=2.0, poll_interval_sec=0.02, exists_fn=exists_fn, time_fn=clk.now
-            )
+    def test_path_appears_before_timeout(self) -> None:
+        """Path appears on the 5th check - returns True after 4 backoff sleeps."""
+        result, checks, elapsed, _ = self._run(lambda n, t: n >= 5, timeout_sec=2.0)
 
-            self.assertTrue(result)
-            # Should have checked 5 times
-            self.assertEqual(check_count, 5)
-            # Time should have advanced by 4 * poll_interval
-            self.assertAlmostEqual(clk.t, 4 * 0.02, places=5)
-        finally:
-            time.sleep = original_sleep
+        self.assertTrue(result)
+        self.assertEqual(checks, 5)
+        # First 4 backoff sleeps: 0.5 ms, x1.5 each
+        self.assertAlmostEqual(elapsed, 0.0005 * (1 + 1.5 + 1.5**2 + 1.5**3), places=9)
 
     def test_path_never_appears_timeout(self) -> None:
         """Path never appears - returns False after timeout."""
-        from lcarstv.player.mpv_player import _wait_for_path_exists
+        result, checks, elapsed, _ = self._run(lambda n, t: False, timeout_sec=0.1)
 
-        clk = FakeClock()
-        path = Path("/tmp/test.sock")
+        self.assertFalse(result)
+        self.assertGreater(checks, 1)
+        self.assertGreaterEqual(elapsed, 0.1)
 
-        check_count = 0
+    def test_path_appears_exactly_at_deadline(self) -> None:
+        """Path appears exactly at deadline - final check succeeds."""
+        result, _, _, _ = self._run(lambda n, t: t >= 2.0, timeout_sec=2.0, poll_interval_sec=0.5)
 
-        def exists_fn(p: Path) -> bool:
-            nonlocal check_count
-            check_count += 1
-            return False
+        self.assertTrue(result)
 
-        # Mock sleep to advance time
-        def mock_sleep(duration: float) -> None:
-            clk.advance(duration)
+    def test_backoff_is_capped_at_poll_interval(self) -> None:
+        """Sleeps grow from 0.5 ms and never exceed poll_interval_sec."""
+        result, _, elapsed, sleeps = self._run(lambda n, t: False, timeout_sec=0.5)
 
-        # Temporarily replace time.sleep
-        import time
+        self.assertFalse(result)
+        self.assertEqual(sleeps[0], 0.0005)
+        self.assertEqual(sorted(sleeps[:-1]), sleeps[:-1])
+        self.assertEqual(max(sleeps), 0.02)
+        # The last sleep is cut short so the wait ends at the deadline, not past it.
+        self.assertLessEqual(sleeps[-1], 0.02)
+        self.assertAlmostEqual(elapsed, 0.5, places=9)
 
+    def test_real_time_sleep_is_not_patched(self) -> None:
+        """Only mpv_player's view of time is faked; the global time.sleep is untouched."""
         original_sleep = time.sleep
-        time.sleep = mock_sleep
-
+        with _fake_sleep(FakeClock().advance):
+            self.assertIs(time.sleep, original_sleep)
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+class WaitForPathInotifyTests(unittest.TestCase):
+    """Test the event-driven (inotify) path of _wait_for_path_exists."""
+
+    def test_wakes_when_path_is_created(self) -> None:
+        """Returns True shortly after another thread creates the path."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "mpv.sock"
+            creator = threading.Timer(0.05, path.touch)
+            creator.start()
+            try:
+                start = time.monotonic()
+                result = _wait_for_path_inotify(path, 5.0)
+                elapsed = time.monotonic() - start
+            finally:
+                creator.join()
+
+        self.assertIs(result, True)
+        self.assertLess(elapsed, 2.0)
+
+    def test_ignores_other_names_and_times_out(self) -> None:
+        """Creating a different file in the directory does not satisfy the wait."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "mpv.sock"
+            (Path(tmpdir) / "other.sock").touch()
+
+            self.assertFalse(_wait_for_path_exists(path, timeout_sec=0.05))
+
+    def test_missing_parent_falls_back_to_polling(self) -> None:
+        """A watch cannot be placed on a missing directory; polling still times out cleanly."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "missing" / "mpv.sock"
+
+            self.assertIsNone(_wait_for_path_inotify(path, 0.05))
+            self.assertFalse(_wait_for_path_exists(path, timeout_sec=0.05, poll_interval_sec=0.01))
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "requires UNIX domain sockets")
+class WaitForSocketConnectableTests(unittest.TestCase):
+    """Test the _wait_for_socket_connectable helper against real UNIX sockets."""
+
+    def setUp(self) -> None:
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = Path(tmpdir.name) / "mpv.sock"
+
+    def _bind(self) -> socket.socket:
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(server.close)
+        server.bind(str(self.path))
+        return server
+
+    def test_listening_socket_is_ready_immediately(self) -> None:
+        """A socket that is already listening is reported ready on the first attempt."""
+        self._bind().listen(1)
+
+        self.assertTrue(_wait_for_socket_connectable(self.path, timeout_sec=0.5))
+
+    def test_waits_for_listen_not_just_the_socket_file(self) -> None:
+        """A bound but not yet listening socket exists on disk yet refuses connections."""
+        server = self._bind()
+        self.assertTrue(_wait_for_path_exists(self.path, timeout_sec=0.0))
+        self.assertFalse(_unix_socket_accepts(self.path))
+
+        listener = threading.Timer(0.05, server.listen, args=(1,))
+        listener.start()
         try:
-            result = _wait_for_path_exists(
-                path, timeout_sec=0.1, poll_interval_sec=0.02, exists_fn=exists_fn, time_fn=clk.now
-            )
-
-            self.assertFalse(result)
-            # Should have checked multiple times (0.1 / 0.02 = 5 times, plus final check)
-            self.assertGreater(check_count, 0)
+            result = _wait_for_socket_connectable(self.path, timeout_sec=5.0)
         finally:
-            time.sleep = original_sleep
+            listener.join()
 
-    def test_path_appears_exactly_at_deadline(self) -> None:
-        """Path appears exactly at deadline - final check succeeds."""
-        from lcarstv.player.mpv_player import _wait_for_path_exists
+        self.assertTrue(result)
 
-        clk = FakeClock()
-        path = Path("/tmp/test.sock")
+    def test_socket_created_later(self) -> None:
+        """Waits through the missing-file phase until the socket is created and listening."""
+        def serve() -> None:
+            self._bind().listen(1)
 
-        check_count = 0
+        creator = threading.Timer(0.05, serve)
+        creator.start()
+        try:
+            result = _wait_for_socket_connectable(self.path, timeout_sec=5.0)
+        finally:
+            creator.join()
 
-        def exists_fn(p: Path) -> bool:
-            nonlocal check_count
-            check_count += 1
-            # Only exists on the final check after timeout
-            return clk.t >= 2.0
+        self.assertTrue(result)
 
-        # Mock sleep to advance time
-        def mock_sleep(duration: float) -> None:
-            clk.advance(duration)
+    def test_missing_socket_times_out(self) -> None:
+        """No socket ever appears - returns False after the timeout."""
+        self.assertFalse(_wait_for_socket_connectable(self.path, timeout_sec=0.05))
 
-        # Temporarily replace time.sleep
-        import time
+    def test_connect_fn_retries_with_backoff(self) -> None:
+        """With an injected probe, connect attempts back off like the existence poll."""
+        clk = FakeClock()
+        attempts: list[float] = []
 
-        original_sleep = time.sleep
-        time.sleep = mock_sleep
+        def connect_fn(p: Path) -> bool:
+            attempts.append(clk.t)
+            return len(attempts) >= 4
 
-        try:
-            result = _wait_for_path_exists(
-                path, timeout_sec=2.0, poll_interval_sec=0.5, exists_fn=exists_fn, time_fn=clk.now
+        with _fake_sleep(clk.advance):
+            result = _wait_for_socket_connectable(
+                self.path, timeout_sec=2.0, connect_fn=connect_fn, time_fn=clk.now
             )
 
-            # Final check at deadline should succeed
-            self.assertTrue(result)
-        finally:
-            time.sleep = original_sleep
+        self.assertTrue(result)
+        self.assertEqual(len(attempts), 4)
+        self.assertAlmostEqual(clk.t, 0.0005 * (1 + 1.5 + 1.5**2), places=9)
 
 
 class GetChapterListTests(unittest.TestCase):
@@ -153,8 +265,6 @@ class GetChapterListTests(unittest.TestCase):
 
     def _make_player_with_ipc(self, ipc_response: dict):
         """Return a MpvPlayer whose IPC client returns the given response."""
-        from lcarstv.player.mpv_player import MpvPlayer
-
         player = MpvPlayer.__new__(MpvPlayer)
         player.debug = False
         player.ipc_trace = False
@@ -163,8 +273,6 @@ class GetChapterListTests(unittest.TestCase):
 
     def test_returns_empty_when_no_ipc(self) -> None:
         """No IPC client → returns []."""
-        from lcarstv.player.mpv_player import MpvPlayer
-
         player = MpvPlayer.__new__(MpvPlayer)
         player.debug = False
         player._ipc = None
@@ -243,8 +351,6 @@ class GetChapterListTests(unittest.TestCase):
 
     def test_ipc_exception_returns_empty(self) -> None:
         """IPC command raises an exception → returns [] without propagating."""
-        from lcarstv.player.mpv_player import MpvPlayer
-
         player = MpvPlayer.__new__(MpvPlayer)
         player.debug = False
         player._ipc = _RaisingIpc()
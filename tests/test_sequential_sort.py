@@ -0,0 +1,120 @@
+"""Tests for sequential (SxxExx) ordering used by sequential playthrough."""
+from __future__ import annotations
+
+from lcarstv.core.selector import (
+    SequentialPlaylist,
+    _parse_episode_info,
+    _sequential_playlist,
+    _sort_items_sequentially,
+)
+
+
+def test_parse_episode_info():
+    """SxxExx is parsed from the filename in either case; other names give None."""
+    assert _parse_episode_info("file:z:/media/show/S01E01 - Pilot.mkv") == (1, 1)
+    assert _parse_episode_info("file:z:/media/show/s02e15 - Episode Name.mp4") == (2, 15)
+    assert _parse_episode_info("file:z:/media/show/Show.S03E22.1080p.mkv") == (3, 22)
+    assert _parse_episode_info(r"z:\media\show\Show.S2023E05.mkv") == (2023, 5)
+    assert _parse_episode_info("file:z:/media/show/random_file.mkv") is None
+    assert _parse_episode_info("file:z:/media/show/Season 1/Episode 10.mkv") is None
+
+
+def test_parse_episode_info_edge_cases():
+    """First complete SxxExx in the filename wins; partial or spaced forms do not match."""
+    assert _parse_episode_info("file:z:/S09E09/Show.S01E02.mkv") == (1, 2)  # Dirs ignored
+    assert _parse_episode_info("file:z:/media/Series S1 - s01e03.mkv") == (1, 3)
+    assert _parse_episode_info("file:z:/media/Show.S01E02E03.mkv") == (1, 2)
+    assert _parse_episode_info("file:z:/media/Show.S001E0007.mkv") == (1, 7)
+    assert _parse_episode_info("file:z:/media/Show S01 E02.mkv") is None
+    assert _parse_episode_info("file:z:/media/Show.S01E.mkv") is None
+    assert _parse_episode_info("file:z:/media/Show.SE01.mkv") is None
+
+def test_sort_by_season_then_episode_with_specials_last():
+    """Episodes sort numerically; items without SxxExx follow alphabetically."""
+    items = (
+        "file:z:/media/show/S01E05 - Fifth Episode.mkv",
+        "file:z:/media/show/S02E01 - Season 2 Premiere.mkv",
+        "file:z:/media/show/zeta_special.mkv",
+        "file:z:/media/show/S01E01 - Pilot.mkv",
+        "file:z:/media/show/S01E10 - Tenth Episode.mkv",
+        "file:z:/media/show/Alpha_special.mkv",
+        "file:z:/media/show/S01E02 - Second Episode.mkv",
+    )
+
+    names = [item.rsplit("/", 1)[-1] for item in _sort_items_sequentially(items)]
+
+    assert names == [
+        "S01E01 - Pilot.mkv",
+        "S01E02 - Second Episode.mkv",
+        "S01E05 - Fifth Episode.mkv",
+        "S01E10 - Tenth Episode.mkv",
+        "S02E01 - Season 2 Premiere.mkv",
+        "Alpha_special.mkv",
+        "zeta_special.mkv",
+    ]
+
+
+def test_sort_ties_keep_input_order():
+    """Items with the same episode number keep their original relative order."""
+    items = (
+        "file:z:/b/S01E02.mkv",
+        "file:z:/a/S01E01.mkv",
+        "file:z:/c/S01E01.mkv",
+    )
+
+    assert _sort_items_sequentially(items) == [
+        "file:z:/a/S01E01.mkv",
+        "file:z:/c/S01E01.mkv",
+        "file:z:/b/S01E02.mkv",
+    ]
+
+
+def test_sort_handles_large_season_and_episode_numbers():
+    """Ordering stays numeric for numbers that do not fit a fixed-width packing."""
+    items = (
+        "file:z:/show/S02E01.mkv",
+        "file:z:/show/S01E70000.mkv",
+        "file:z:/show/S01E65536.mkv",
+        "file:z:/show/S2023E05.mkv",
+        "file:z:/show/S01E02.mkv",
+    )
+
+    assert _sort_items_sequentially(items) == [
+        "file:z:/show/S01E02.mkv",
+        "file:z:/show/S01E65536.mkv",
+        "file:z:/show/S01E70000.mkv",
+        "file:z:/show/S02E01.mkv",
+        "file:z:/show/S2023E05.mkv",
+    ]
+
+def test_playlist_picks_in_sequential_order_and_wraps():
+    """Playlist picks follow _sort_items_sequentially and wrap past the end."""
+    items = (
+        "file:z:/show/S01E03.mkv",
+        "file:z:/show/special.mkv",
+        "file:z:/show/S01E01.mkv",
+        "file:z:/show/S01E02.mkv",
+    )
+    playlist = SequentialPlaylist(items)
+
+    assert len(playlist) == 4
+    assert [playlist.pick(i) for i in range(4)] == _sort_items_sequentially(items)
+    assert playlist.pick(4) == "file:z:/show/S01E01.mkv"
+
+
+def test_playlist_is_reused_for_the_same_items():
+    """Repeated picks on an equal item tuple share one sorted playlist."""
+    items = ("file:z:/show/S01E02.mkv", "file:z:/show/S01E01.mkv")
+
+    assert _sequential_playlist(items) is _sequential_playlist(tuple(list(items)))
+
+
+def test_sort_parses_each_item_once():
+    """Each item is parsed exactly once per sort, however many comparisons run."""
+    items = tuple(f"file:z:/show/S01E{n:02d}.mkv" for n in range(40, 0, -1))
+    _parse_episode_info.cache_clear()
+
+    _sort_items_sequentially(items)
+
+    info = _parse_episode_info.cache_info()
+    assert (info.hits, info.misses) == (0, len(items))
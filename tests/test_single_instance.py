@@ -1,214 +1,280 @@
+"""Tests for SingleInstanceLock, which prevents concurrent application instances."""
 from __future__ import annotations
 
+import errno
 import os
-import tempfile
-import unittest
+import subprocess
+import sys
+import time
 from pathlib import Path
+from unittest import mock
 
+import pytest
 
-class SingleInstanceLockTests(unittest.TestCase):
-    """Test the SingleInstanceLock class for preventing concurrent application instances."""
-
-    def test_windows_always_succeeds(self) -> None:
-        """On Windows (or when enabled=False), lock always succeeds (no-op behavior)."""
-        from lcarstv.core.single_instance import SingleInstanceLock
-
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            lockpath = tmp.name
-
-        try:
-            # Create two locks with enabled=False (Windows behavior)
-            lock1 = SingleInstanceLock(path=lockpath, enabled=False)
-            lock2 = SingleInstanceLock(path=lockpath, enabled=False)
-
-            # Both should succeed
-            self.assertTrue(lock1.acquire())
-            self.assertTrue(lock1.acquired)
-            self.assertTrue(lock2.acquire())
-            self.assertTrue(lock2.acquired)
-
-            lock1.release()
-            lock2.release()
-        finally:
-            try:
-                os.unlink(lockpath)
-            except Exception:
-                pass
-
-    @unittest.skipIf(os.name == "nt", "fcntl-based locking not available on Windows")
-    def test_acquire_release_cycle(self) -> None:
-        """Acquire and release lock, then acquire again - should succeed."""
-        from lcarstv.core.single_instance import SingleInstanceLock
-
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            lockpath = tmp.name
-
-        try:
-            lock = SingleInstanceLock(path=lockpath, enabled=True)
-
-            # First acquisition should succeed
-            self.assertTrue(lock.acquire())
-            self.assertTrue(lock.acquired)
-
-            # Release the lock
-            lock.release()
-            self.assertFalse(lock.acquired)
-
-            # Should be able to acquire again after release
-            self.assertTrue(lock.acquire())
-            self.assertTrue(lock.acquired)
-
-            lock.release()
-        finally:
-            try:
-                os.unlink(lockpath)
-            except Exception:
-                pass
-
-    @unittest.skipIf(os.name == "nt", "fcntl-based locking not available on Windows")
-    def test_two_instances_conflict(self) -> None:
-        """Two lock instances with the same path should conflict."""
-        from lcarstv.core.single_instance import SingleInstanceLock
-
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            lockpath = tmp.name
-
-        try:
-            lock1 = SingleInstanceLock(path=lockpath, enabled=True)
-            lock2 = SingleInstanceLock(path=lockpath, enabled=True)
-
-            # First lock should succeed
-            self.assertTrue(lock1.acquire())
-            self.assertTrue(lock1.acquired)
-
-            # Second lock should fail (already held by lock1)
-            self.assertFalse(lock2.acquire())
-            self.assertFalse(lock2.acquired)
-
-            # After releasing lock1, lock2 should succeed
-            lock1.release()
-            self.assertFalse(lock1.acquired)
-
-            self.assertTrue(lock2.acquire())
-            self.assertTrue(lock2.acquired)
-
-            lock2.release()
-        finally:
-            try:
-                os.unlink(lockpath)
-            except Exception:
-                pass
-
-    @unittest.skipIf(os.name == "nt", "fcntl-based locking not available on Windows")
-    def test_context_manager(self) -> None:
-        """Test lock works correctly as a context manager."""
-        from lcarstv.core.single_instance import SingleInstanceLock
-
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            lockpath = tmp.name
-
-        try:
-            # Use lock as a context manager
-            with SingleInstanceLock(path=lockpath, enabled=True) as lock1:
-                self.assertTrue(lock1.acquired)
-
-                # Try to acquire with another instance while first is held
-                lock2 = SingleInstanceLock(path=lockpath, enabled=True)
-                self.assertFalse(lock2.acquire())
-
-            # After exiting context, lock1 should be released
-            self.assertFalse(lock1.acquired)
-
-            # Now lock2 should be able to acquire
-            self.assertTrue(lock2.acquire())
-            self.assertTrue(lock2.acquired)
-            lock2.release()
-        finally:
-            try:
-                os.unlink(lockpath)
-            except Exception:
-                pass
-
-    @unittest.skipIf(os.name == "nt", "fcntl-based locking not available on Windows")
-    def test_lockfile_contains_pid(self) -> None:
-        """After acquiring lock, lockfile should contain the PID."""
-        from lcarstv.core.single_instance import SingleInstanceLock
-
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            lockpath = tmp.name
-
-        try:
-            lock = SingleInstanceLock(path=lockpath, enabled=True)
-            self.assertTrue(lock.acquire())
-
-            # Read lockfile contents
-            with open(lockpath, "r") as f:
-                content = f.read().strip()
-
-            # Should contain the current process PID
-            self.assertEqual(content, str(os.getpid()))
-
-            lock.release()
-        finally:
-            try:
-                os.unlink(lockpath)
-            except Exception:
-                pass
-
-    @unittest.skipIf(os.name == "nt", "fcntl-based locking not available on Windows")
-    def test_multiple_release_is_safe(self) -> None:
-        """Calling release() multiple times should be safe (idempotent)."""
-        from lcarstv.core.single_instance import SingleInstanceLock
-
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            lockpath = tmp.name
-
-        try:
-            lock = SingleInstanceLock(path=lockpath, enabled=True)
-            self.assertTrue(lock.acquire())
-
-            # Release multiple times - should not raise
-            lock.release()
-            lock.release()
-            lock.release()
-
-            self.assertFalse(lock.acquired)
-        finally:
-            try:
-                os.unlink(lockpath)
-            except Exception:
-                pass
-
-    @unittest.skipIf(os.name == "nt", "fcntl-based locking not available on Windows")
-    def test_different_paths_no_conflict(self) -> None:
-        """Locks with different paths should not conflict."""
-        from lcarstv.core.single_instance import SingleInstanceLock
-
-        with tempfile.NamedTemporaryFile(delete=False) as tmp1:
-            lockpath1 = tmp1.name
-        with tempfile.NamedTemporaryFile(delete=False) as tmp2:
-            lockpath2 = tmp2.name
-
-        try:
-            lock1 = SingleInstanceLock(path=lockpath1, enabled=True)
-            lock2 = SingleInstanceLock(path=lockpath2, enabled=True)
-
-            # Both should succeed since they use different lockfiles
-            self.assertTrue(lock1.acquire())
-            self.assertTrue(lock2.acquire())
-
-            lock1.release()
-            lock2.release()
-        finally:
-            try:
-                os.unlink(lockpath1)
-            except Exception:
-                pass
-            try:
-                os.unlink(lockpath2)
-            except Exception:
-                pass
-
-
-if __name__ == "__main__":
-    unittest.main()
+from lcarstv.core import single_instance
+from lcarstv.core.single_instance import SingleInstanceLock
+
+posix_only = pytest.mark.skipif(os.name == "nt", reason="fcntl-based locking not available on Windows")
+
+
+def test_windows_always_succeeds(tmp_path: Path) -> None:
+    """On Windows (or when enabled=False), lock always succeeds (no-op behavior)."""
+    lockpath = str(tmp_path / "app.lock")
+
+    # Create two locks with enabled=False (Windows behavior)
+    lock1 = SingleInstanceLock(path=lockpath, enabled=False)
+    lock2 = SingleInstanceLock(path=lockpath, enabled=False)
+
+    # Both should succeed
+    assert lock1.acquire()
+    assert lock1.acquired
+    assert lock2.acquire()
+    assert lock2.acquired
+
+    lock1.release()
+    lock2.release()
+
+
+@posix_only
+def test_acquire_release_cycle(tmp_path: Path) -> None:
+    """Acquire and release lock, then acquire again - should succeed."""
+    lock = SingleInstanceLock(path=str(tmp_path / "app.lock"), enabled=True)
+
+    # First acquisition should succeed
+    assert lock.acquire()
+    assert lock.acquired
+
+    # Release the lock
+    lock.release()
+    assert not lock.acquired
+
+    # Should be able to acquire again after release
+    assert lock.acquire()
+    assert lock.acquired
+
+    lock.release()
+
+
+@posix_only
+def test_two_instances_conflict(tmp_path: Path) -> None:
+    """Two lock instances with the same path should conflict."""
+    lockpath = str(tmp_path / "app.lock")
+    lock1 = SingleInstanceLock(path=lockpath, enabled=True)
+    lock2 = SingleInstanceLock(path=lockpath, enabled=True)
+
+    # First lock should succeed
+    assert lock1.acquire()
+    assert lock1.acquired
+
+    # Second lock should fail (already held by lock1), without waiting for it
+    start = time.monotonic()
+    ok = lock2.acquire()
+    assert time.monotonic() - start < 0.05
+    assert not ok
+    assert not lock2.acquired
+
+    # After releasing lock1, lock2 should succeed
+    lock1.release()
+    assert not lock1.acquired
+
+    assert lock2.acquire()
+    assert lock2.acquired
+
+    lock2.release()
+
+
+@posix_only
+def test_context_manager(tmp_path: Path) -> None:
+    """Test lock works correctly as a context manager."""
+    lockpath = str(tmp_path / "app.lock")
+
+    # Use lock as a context manager
+    with SingleInstanceLock(path=lockpath, enabled=True) as lock1:
+        assert lock1.acquired
+
+        # Try to acquire with another instance while first is held
+        lock2 = SingleInstanceLock(path=lockpath, enabled=True)
+        assert not lock2.acquire()
+
+    # After exiting context, lock1 should be released
+    assert not lock1.acquired
+
+    # Now lock2 should be able to acquire
+    assert lock2.acquire()
+    assert lock2.acquired
+    lock2.release()
+
+
+@posix_only
+def test_lockfile_contains_pid(tmp_path: Path) -> None:
+    """After acquiring lock, lockfile should contain the PID."""
+    lockpath = tmp_path / "app.lock"
+    lock = SingleInstanceLock(path=str(lockpath), enabled=True)
+    assert lock.acquire()
+
+    # Should contain the current process PID
+    assert lockpath.read_text().strip() == str(os.getpid())
+
+    lock.release()
+
+
+@posix_only
+@pytest.mark.parametrize("stale", ["999999999\nleftover\n", "1\n", ""])
+def test_stale_lockfile_is_reused(tmp_path: Path, stale: str) -> None:
+    """A leftover lockfile from an earlier run is reopened and its content replaced."""
+    lockpath = tmp_path / "app.lock"
+    lockpath.write_text(stale)
+
+    lock = SingleInstanceLock(path=str(lockpath), enabled=True)
+    assert lock.acquire()
+
+    assert lockpath.read_text() == f"{os.getpid()}\n"
+
+    lock.release()
+
+
+@posix_only
+def test_unexpected_flock_error_closes_fd(tmp_path: Path) -> None:
+    """A flock failure other than contention reports failure without leaking the fd."""
+    lock = SingleInstanceLock(path=str(tmp_path / "app.lock"), enabled=True)
+    with mock.patch.object(
+        single_instance.fcntl, "flock", side_effect=OSError(errno.ENOLCK, "No locks available")
+    ), mock.patch.object(single_instance.os, "close", wraps=os.close) as close:
+        assert not lock.acquire()
+
+    close.assert_called_once()
+    assert not lock.acquired
+    assert lock._fd is None
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_writes_its_own_pid(tmp_path: Path) -> None:
+    """A child forked after import records its own PID, not the parent's."""
+    lockpath = tmp_path / "app.lock"
+
+    pid = os.fork()
+    if pid == 0:
+        lock = SingleInstanceLock(path=str(lockpath), enabled=True)
+        os._exit(0 if lock.acquire() else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    assert lockpath.read_text().strip() == str(pid)
+
+
+@posix_only
+def test_spawned_child_does_not_inherit_lock(tmp_path: Path) -> None:
+    """A process exec'd by the lock holder (even with close_fds=False) cannot keep it.
+
+    The holder exits without release() while its child is still running, as
+    when the app dies with mpv alive. An inherited descriptor would keep the
+    flock held until the child exited too.
+    """
+    lockpath = str(tmp_path / "app.lock")
+    holder = (
+        "import os, subprocess, sys\n"
+        "from lcarstv.core.single_instance import SingleInstanceLock\n"
+        "assert SingleInstanceLock(path=sys.argv[1], enabled=True).acquire()\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'],\n"
+        "                         stdout=subprocess.DEVNULL, close_fds=False)\n"
+        "print(child.pid, flush=True)\n"
+        "os._exit(0)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", holder, lockpath],
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parents[1],
+    )
+    child_pid = int(proc.stdout)
+    try:
+        other = SingleInstanceLock(path=lockpath, enabled=True)
+        assert other.acquire()
+        other.release()
+    finally:
+        os.kill(child_pid, 9)
+
+
+@pytest.mark.skipif(
+    os.name == "nt" or bool(os.getenv("CI_SLOW_FS")),
+    reason="fcntl-based locking not available on Windows; timing unreliable with CI_SLOW_FS",
+)
+def test_concurrent_acquire_no_stall(tmp_path: Path) -> None:
+    """Many processes racing for the lock: exactly one wins and nobody waits on contention.
+
+    Each process keeps its outcome (and the lock, if it won) until the test has
+    heard from all of them, so the race is decided while every contender is alive.
+    Only the acquire() call itself is timed; interpreter startup is not part of it.
+    """
+    racer = (
+        "import sys, time\n"
+        "from lcarstv.core.single_instance import SingleInstanceLock\n"
+        "lock = SingleInstanceLock(path=sys.argv[1], enabled=True)\n"
+        "start = time.monotonic()\n"
+        "ok = lock.acquire()\n"
+        "print(int(ok), time.monotonic() - start, flush=True)\n"
+        "sys.stdin.read()\n"
+    )
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", racer, str(tmp_path / "app.lock")],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            cwd=Path(__file__).resolve().parents[1],
+        )
+        for _ in range(10)
+    ]
+    try:
+        results = [proc.stdout.readline().split() for proc in procs]
+    finally:
+        for proc in procs:
+            proc.communicate()
+
+    assert sum(int(ok) for ok, _ in results) == 1
+    assert max(float(elapsed) for _, elapsed in results) < 1.0
+
+
+@posix_only
+def test_multiple_release_is_safe(tmp_path: Path) -> None:
+    """Calling release() multiple times should be safe (idempotent)."""
+    lock = SingleInstanceLock(path=str(tmp_path / "app.lock"), enabled=True)
+    assert lock.acquire()
+
+    # Release multiple times - should not raise
+    lock.release()
+    lock.release()
+    lock.release()
+
+    assert not lock.acquired
+
+
+@posix_only
+def test_repeated_release_makes_no_syscalls(tmp_path: Path) -> None:
+    """Only the first release() unlocks and closes; later calls do nothing."""
+    lock = SingleInstanceLock(path=str(tmp_path / "app.lock"), enabled=True)
+    assert lock.acquire()
+
+    with mock.patch.object(single_instance.os, "close", wraps=os.close) as close:
+        lock.release()
+        lock.release()
+        lock.release()
+
+    close.assert_called_once()
+    assert not lock.acquired
+
+
+@posix_only
+def test_different_paths_no_conflict(tmp_path: Path) -> None:
+    """Locks with different paths should not conflict."""
+    lock1 = SingleInstanceLock(path=str(tmp_path / "one.lock"), enabled=True)
+    lock2 = SingleInstanceLock(path=str(tmp_path / "two.lock"), enabled=True)
+
+    # Both should succeed since they use different lockfiles
+    assert lock1.acquire()
+    assert lock2.acquire()
+
+    lock1.release()
+    lock2.release()